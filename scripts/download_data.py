@@ -9,39 +9,80 @@ Usage example:
 from __future__ import annotations
 
 import argparse
-import csv
+import asyncio
+import collections
+import contextlib
 import datetime as dt
+import itertools
 import os
+import random
 import sys
-import time
 from pathlib import Path
-from typing import Iterable, List, Mapping, Optional, Tuple
+from typing import IO, TYPE_CHECKING, AsyncIterator, Deque, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
 
-import requests
+import httpx
+import numpy as np
+import orjson
+import pandas as pd
 
+if TYPE_CHECKING:
+    import pyarrow.parquet as pq
 
-def _iso_from_ms(ms: int) -> str:
-    """Convert polygon epoch milliseconds to ISO-8601 with UTC suffix."""
-    return dt.datetime.utcfromtimestamp(ms / 1000).isoformat() + "Z"
+INTRADAY_FIELDS = ["timestamp", "open", "high", "low", "close", "volume"]
+DAILY_FIELDS = ["date", "open", "high", "low", "close", "volume"]
+CSV_BATCH_ROWS = 10_000
+WRITE_BUFFER_BYTES = 1 << 22  # 4 MiB: coalesce chunk writes into few write() syscalls
+ISO_UTC_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+MS_PER_DAY = 86_400_000
+EPOCH_ORDINAL = dt.date(1970, 1, 1).toordinal()
 
 
 class PolygonClient:
+    """
+    Async Polygon client sharing one HTTP/2 keep-alive connection pool.
+
+    Use as ``async with PolygonClient(...) as client``; concurrent requests are
+    multiplexed over the pooled connections and at most `max_concurrency` are in
+    flight at once so concurrent chunks respect the rate limit. `transport` replaces
+    the network transport (e.g. an ``httpx.MockTransport`` in tests).
+    """
+
     def __init__(
         self,
         api_key: str,
         throttle_seconds: float = 0.25,
         base_url: str = "https://api.polygon.io",
         max_retries: int = 5,
-        sleep_on_429: float = 5.0,
+        sleep_on_429: float = 0.5,
+        max_backoff: float = 30.0,
+        max_concurrency: int = 4,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
     ):
         self.api_key = api_key
-        self.session = requests.Session()
+        self.transport = transport
+        self.client: Optional[httpx.AsyncClient] = None
         self.throttle_seconds = throttle_seconds
         self.base_url = base_url.rstrip("/")
         self.max_retries = max_retries
         self.sleep_on_429 = sleep_on_429
+        self.max_backoff = max_backoff
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def __aenter__(self) -> "PolygonClient":
+        self.client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=40),
+            timeout=30,
+            transport=self.transport,
+        )
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
 
-    def fetch_aggs(
+    async def fetch_aggs(
         self,
         ticker: str,
         multiplier: int,
@@ -53,6 +94,9 @@ class PolygonClient:
     ) -> List[Mapping[str, object]]:
         """Fetch aggregated bars from Polygon, handling pagination."""
 
+        if self.client is None:
+            raise RuntimeError("PolygonClient must be used as an async context manager")
+
         url = f"{self.base_url}/v2/aggs/ticker/{ticker}/range/{multiplier}/{timespan}/{start}/{end}"
         params = {
             "adjusted": "true" if adjusted else "false",
@@ -66,70 +110,146 @@ class PolygonClient:
         while url:
             attempts = 0
             while True:
-                resp = self.session.get(url, params=params, timeout=30)
-                if resp.status_code == 429 and attempts < self.max_retries:
+                async with self._semaphore:
+                    resp = await self.client.get(url, params=params)
+                retryable = resp.status_code == 429 or resp.status_code >= 500
+                if retryable and attempts < self.max_retries:
+                    await asyncio.sleep(self._retry_delay(resp, attempts))
                     attempts += 1
-                    time.sleep(self.sleep_on_429 * attempts)
                     continue
                 break
 
             if resp.status_code != 200:
                 raise RuntimeError(f"Polygon error {resp.status_code}: {resp.text}")
-            payload = resp.json()
+            payload = orjson.loads(resp.content)
             results.extend(payload.get("results", []))
 
             next_url = payload.get("next_url")
-            # Polygon/Massive sometimes includes apiKey in next_url; avoid duplicating.
+            # Polygon/Massive sometimes includes apiKey in next_url; avoid duplicating. httpx
+            # replaces a URL's query string when `params` is passed, so the key is merged into
+            # next_url itself to keep its cursor.
             params = None
             if next_url and "apiKey" not in next_url:
-                params = {"apiKey": self.api_key}
+                next_url = str(httpx.URL(next_url).copy_merge_params({"apiKey": self.api_key}))
             url = next_url
 
             if url:
-                time.sleep(self.throttle_seconds)
+                await asyncio.sleep(self.throttle_seconds)
 
         return results
 
+    def _retry_delay(self, resp: httpx.Response, attempts: int) -> float:
+        """Honor a numeric Retry-After header, else exponential backoff with jitter."""
+
+        retry_after = resp.headers.get("Retry-After")
+        if retry_after is not None:
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                pass  # HTTP-date form; fall back to exponential backoff
+        return min(self.max_backoff, self.sleep_on_429 * 2**attempts) * random.uniform(0.5, 1.5)
 
-def _to_intraday_rows(results: Iterable[Mapping[str, object]]) -> List[Mapping[str, object]]:
-    rows = []
-    for r in results:
-        rows.append(
-            {
-                "timestamp": _iso_from_ms(int(r["t"])),
-                "open": r["o"],
-                "high": r["h"],
-                "low": r["l"],
-                "close": r["c"],
-                "volume": r["v"],
-            }
-        )
-    return rows
 
+def _to_intraday_frame(results: Sequence[Mapping[str, object]]) -> pd.DataFrame:
+    """Build intraday bars column-wise, converting epoch-ms timestamps to UTC datetimes in one vectorized pass."""
 
-def _to_daily_rows(results: Iterable[Mapping[str, object]]) -> List[Mapping[str, object]]:
-    rows = []
+    def column(key: str, dtype: type) -> np.ndarray:
+        return np.fromiter((r[key] for r in results), dtype=dtype, count=len(results))
+
+    return pd.DataFrame(
+        {
+            "timestamp": pd.to_datetime(column("t", np.int64), unit="ms", utc=True),
+            "open": column("o", np.float64),
+            "high": column("h", np.float64),
+            "low": column("l", np.float64),
+            "close": column("c", np.float64),
+            "volume": column("v", np.float64),
+        }
+    )
+
+
+def _iso_date_from_ms(ms: int) -> str:
+    """UTC calendar date of epoch milliseconds via integer day math (no datetime/timezone round trip)."""
+    return dt.date.fromordinal(EPOCH_ORDINAL + ms // MS_PER_DAY).isoformat()
+
+
+def _to_daily_tuples(results: Iterable[Mapping[str, object]]) -> Iterator[Tuple[object, ...]]:
+    """Yield rows in DAILY_FIELDS order."""
     for r in results:
-        ts = dt.datetime.utcfromtimestamp(int(r["t"]) / 1000).date().isoformat()
-        rows.append(
-            {
-                "date": ts,
-                "open": r["o"],
-                "high": r["h"],
-                "low": r["l"],
-                "close": r["c"],
-                "volume": r["v"],
-            }
-        )
-    return rows
+        yield (_iso_date_from_ms(int(r["t"])), r["o"], r["h"], r["l"], r["c"], r["v"])
 
 
-def _write_csv(path: Path, fieldnames: Iterable[str], rows: Iterable[Mapping[str, object]]) -> None:
+def _part_path(path: Path) -> Path:
+    """Temporary sibling that output is streamed into before being renamed to `path`."""
+    return path.with_name(path.name + ".part")
+
+
+def _open_csv(path: Path, fieldnames: Sequence[str]) -> IO[str]:
+    """Create `path` with a header row and return the open file for streaming rows."""
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    f = path.open("w", newline="", buffering=WRITE_BUFFER_BYTES)
+    f.write(",".join(fieldnames) + "\n")
+    return f
+
+
+def _open_parquet_writer(path: Path) -> pq.ParquetWriter:
+    """Create a zstd-compressed Parquet writer for intraday bars; chunks are appended as row groups."""
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema(
+        [
+            ("timestamp", pa.timestamp("ms", tz="UTC")),
+            ("open", pa.float64()),
+            ("high", pa.float64()),
+            ("low", pa.float64()),
+            ("close", pa.float64()),
+            ("volume", pa.float64()),
+        ]
+    )
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(rows)
+    return pq.ParquetWriter(path, schema, compression="zstd")
+
+
+def _write_parquet_chunk(writer: pq.ParquetWriter, frame: pd.DataFrame) -> None:
+    import pyarrow as pa
+
+    writer.write_table(pa.Table.from_pandas(frame, schema=writer.schema, preserve_index=False))
+
+
+def _write_rows(
+    f: IO[str],
+    n_fields: int,
+    rows: Iterable[Tuple[object, ...]],
+    batch_size: int = CSV_BATCH_ROWS,
+) -> None:
+    """
+    Append row tuples as CSV lines with one `write` per batch.
+
+    Values are numbers or ISO timestamps, so the csv module's quoting checks are skipped.
+    """
+
+    line = ",".join(["{}"] * n_fields)
+    it = iter(rows)
+    while True:
+        batch = [line.format(*r) for r in itertools.islice(it, batch_size)]
+        if not batch:
+            break
+        f.write("\n".join(batch) + "\n")
+
+
+def _commit_parts(paths: Iterable[Path]) -> None:
+    """Atomically move each completed .part file onto its final path."""
+    for path in paths:
+        os.replace(_part_path(path), path)
+
+
+def _discard_parts(paths: Iterable[Path]) -> None:
+    """Remove .part files left behind by a failed write (no-op after `_commit_parts`)."""
+    for path in paths:
+        _part_path(path).unlink(missing_ok=True)
 
 
 def parse_args(argv: Optional[Iterable[str]] = None) -> argparse.Namespace:
@@ -138,6 +258,12 @@ def parse_args(argv: Optional[Iterable[str]] = None) -> argparse.Namespace:
     parser.add_argument("--start-date", required=True, help="Start date (YYYY-MM-DD)")
     parser.add_argument("--end-date", required=True, help="End date (YYYY-MM-DD)")
     parser.add_argument("--intraday-path", default="data/spy_1min.csv", help="Output CSV for intraday bars")
+    parser.add_argument(
+        "--format",
+        choices=("csv", "parquet", "both"),
+        default="csv",
+        help="Intraday output format; Parquet is written next to --intraday-path with a .parquet suffix (default: csv)",
+    )
     parser.add_argument("--daily-path", default="data/spy_daily.csv", help="Output CSV for daily bars")
     parser.add_argument("--api-key", default=None, help="Polygon API key (or set POLYGON_API_KEY env var)")
     parser.add_argument(
@@ -151,12 +277,24 @@ def parse_args(argv: Optional[Iterable[str]] = None) -> argparse.Namespace:
         default="https://api.polygon.io",
         help="Base URL for API (use https://api.massive.com if using Massive)",
     )
-    parser.add_argument("--max-retries", type=int, default=5, help="Retries on 429 responses (default: 5)")
+    parser.add_argument("--max-retries", type=int, default=5, help="Retries on 429/5xx responses (default: 5)")
     parser.add_argument(
         "--sleep-on-429",
         type=float,
-        default=5.0,
-        help="Seconds to wait on 429 backoff (multiplied by attempt count).",
+        default=0.5,
+        help="Base backoff in seconds on 429/5xx, doubled per attempt with jitter unless Retry-After is sent (default: 0.5s)",
+    )
+    parser.add_argument(
+        "--max-backoff",
+        type=float,
+        default=30.0,
+        help="Upper bound in seconds for a single exponential backoff sleep (default: 30s)",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=4,
+        help="Maximum number of requests in flight at once (default: 4)",
     )
     return parser.parse_args(list(argv) if argv is not None else None)
 
@@ -173,6 +311,125 @@ def month_chunks(start: dt.date, end: dt.date) -> List[Tuple[str, str]]:
     return chunks
 
 
+def _intraday_outputs(intraday_path: str, fmt: str) -> List[Tuple[Path, str]]:
+    """(path, kind) for each requested intraday format; Parquet goes next to the CSV path with a .parquet suffix."""
+    outputs = []
+    if fmt in ("csv", "both"):
+        outputs.append((Path(intraday_path), "csv"))
+    if fmt in ("parquet", "both"):
+        outputs.append((Path(intraday_path).with_suffix(".parquet"), "parquet"))
+    return outputs
+
+
+async def _fetch_chunks_in_order(
+    client: PolygonClient,
+    ticker: str,
+    chunks: Sequence[Tuple[str, str]],
+    window: int,
+    pause: float,
+) -> AsyncIterator[List[Mapping[str, object]]]:
+    """
+    Yield each (start, end) chunk's intraday bars in order, fetching at most `window` chunks ahead.
+
+    A chunk is only started when a slot frees up, so finished chunks waiting behind a slow
+    head chunk never number more than `window`; starts are also spaced `pause` seconds apart,
+    like the pause between chunks of a sequential download.
+    """
+
+    loop = asyncio.get_running_loop()
+
+    async def fetch(start: str, end: str, delay: float) -> List[Mapping[str, object]]:
+        await asyncio.sleep(delay)
+        print(f"Fetching intraday 1-min bars for {ticker} from {start} to {end}...")
+        return await client.fetch_aggs(ticker, multiplier=1, timespan="minute", start=start, end=end)
+
+    todo = iter(chunks)
+    pending: Deque[asyncio.Task] = collections.deque()
+    next_start = loop.time()
+    try:
+        while True:
+            for start, end in itertools.islice(todo, window - len(pending)):
+                now = loop.time()
+                next_start = max(next_start, now)
+                pending.append(asyncio.create_task(fetch(start, end, next_start - now)))
+                next_start += pause
+            if not pending:
+                return
+            yield await pending.popleft()
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def _download(args: argparse.Namespace, api_key: str, start_date: dt.date, end_date: dt.date) -> None:
+    async with PolygonClient(
+        api_key=api_key,
+        throttle_seconds=args.throttle_seconds,
+        base_url=args.base_url,
+        max_retries=args.max_retries,
+        sleep_on_429=args.sleep_on_429,
+        max_backoff=args.max_backoff,
+        max_concurrency=args.max_concurrency,
+    ) as client:
+        # Chunk intraday calls by month; chunks are fetched concurrently under the client's
+        # semaphore, a bounded number ahead of the writer, and streamed to disk in order.
+        intraday_chunks = _fetch_chunks_in_order(
+            client,
+            args.ticker,
+            month_chunks(start_date, end_date),
+            window=args.max_concurrency + 1,
+            pause=args.throttle_seconds,
+        )
+        print(f"Fetching daily bars for {args.ticker} from {args.start_date} to {args.end_date}...")
+        daily_task = asyncio.create_task(
+            client.fetch_aggs(args.ticker, multiplier=1, timespan="day", start=args.start_date, end=args.end_date)
+        )
+
+        intraday_outputs = _intraday_outputs(args.intraday_path, args.format)
+        intraday_paths = [path for path, _ in intraday_outputs]
+
+        try:
+            n_intraday = 0
+            with contextlib.ExitStack() as stack:
+                # Stream into .part files and rename them only once every chunk is written, so
+                # an interrupted download never leaves a truncated file at the output path.
+                csv_file = parquet_writer = None
+                for path, kind in intraday_outputs:
+                    if kind == "parquet":
+                        parquet_writer = stack.enter_context(_open_parquet_writer(_part_path(path)))
+                    else:
+                        csv_file = stack.enter_context(_open_csv(_part_path(path), INTRADAY_FIELDS))
+
+                async with contextlib.aclosing(intraday_chunks):
+                    async for intraday_chunk in intraday_chunks:
+                        frame = _to_intraday_frame(intraday_chunk)
+                        if csv_file is not None:
+                            frame.to_csv(csv_file, header=False, index=False, date_format=ISO_UTC_FORMAT)
+                        if parquet_writer is not None:
+                            _write_parquet_chunk(parquet_writer, frame)
+                        n_intraday += len(intraday_chunk)
+            _commit_parts(intraday_paths)
+            print(f"Wrote {n_intraday} intraday rows to {', '.join(str(p) for p in intraday_paths)}")
+
+            daily = await daily_task
+        except BaseException:
+            _discard_parts(intraday_paths)
+            daily_task.cancel()
+            await asyncio.gather(daily_task, return_exceptions=True)
+            raise
+
+    daily_path = Path(args.daily_path)
+    try:
+        with _open_csv(_part_path(daily_path), DAILY_FIELDS) as f:
+            _write_rows(f, len(DAILY_FIELDS), _to_daily_tuples(daily))
+    except BaseException:
+        _discard_parts([daily_path])
+        raise
+    _commit_parts([daily_path])
+    print(f"Wrote {len(daily)} daily rows to {args.daily_path}")
+
+
 def main(argv: Optional[Iterable[str]] = None) -> int:
     args = parse_args(argv)
     api_key = args.api_key or os.getenv("POLYGON_API_KEY")
@@ -180,44 +437,18 @@ def main(argv: Optional[Iterable[str]] = None) -> int:
         print("Missing Polygon API key. Set POLYGON_API_KEY or pass --api-key.", file=sys.stderr)
         return 1
 
-    client = PolygonClient(
-        api_key=api_key,
-        throttle_seconds=args.throttle_seconds,
-        base_url=args.base_url,
-        max_retries=args.max_retries,
-        sleep_on_429=args.sleep_on_429,
-    )
-
     start_date = dt.date.fromisoformat(args.start_date)
     end_date = dt.date.fromisoformat(args.end_date)
     if start_date > end_date:
         print("start-date must be on or before end-date.", file=sys.stderr)
         return 1
 
-    # Chunk intraday calls by month to stay under rate limits.
-    intraday_rows: List[Mapping[str, object]] = []
-    for chunk_start, chunk_end in month_chunks(start_date, end_date):
-        print(f"Fetching intraday 1-min bars for {args.ticker} from {chunk_start} to {chunk_end}...")
-        intraday_chunk = client.fetch_aggs(
-            args.ticker,
-            multiplier=1,
-            timespan="minute",
-            start=chunk_start,
-            end=chunk_end,
-        )
-        intraday_rows.extend(_to_intraday_rows(intraday_chunk))
-        # Brief pause between chunks to avoid per-minute caps.
-        time.sleep(args.throttle_seconds)
-
-    _write_csv(Path(args.intraday_path), ["timestamp", "open", "high", "low", "close", "volume"], intraday_rows)
-    print(f"Wrote {len(intraday_rows)} intraday rows to {args.intraday_path}")
-
-    print(f"Fetching daily bars for {args.ticker} from {args.start_date} to {args.end_date}...")
-    daily = client.fetch_aggs(args.ticker, multiplier=1, timespan="day", start=args.start_date, end=args.end_date)
-    daily_rows = _to_daily_rows(daily)
-    _write_csv(Path(args.daily_path), ["date", "open", "high", "low", "close", "volume"], daily_rows)
-    print(f"Wrote {len(daily_rows)} daily rows to {args.daily_path}")
+    paths = [path for path, _ in _intraday_outputs(args.intraday_path, args.format)]
+    if len(set(paths)) != len(paths):
+        print("--format both needs an --intraday-path without a .parquet suffix.", file=sys.stderr)
+        return 1
 
+    asyncio.run(_download(args, api_key, start_date, end_date))
     return 0
 
 
@@ -8,19 +8,22 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import itertools
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Iterable
+from typing import Dict, Iterable, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from src.analytics import summarize_equity  # noqa: E402
-from src.backtester import Backtester, BacktesterConfig  # noqa: E402
-from src.data_loader import load_daily, load_intraday  # noqa: E402
+from src.analytics import compute_benchmark_returns, summarize_equity  # noqa: E402
+from src.backtester import Backtester, BacktesterConfig, prepare_features  # noqa: E402
+from src.data_loader import clip_date_range, load_daily, load_intraday  # noqa: E402
 
 
 def parse_args() -> argparse.Namespace:
@@ -34,26 +37,47 @@ def parse_args() -> argparse.Namespace:
     p.add_argument("--sigma-target", nargs="+", type=float, default=[0.015, 0.018, 0.02], help="Target daily vol levels to test")
     p.add_argument("--earliest-entry", nargs="+", default=["10:00", "10:30"], help="Earliest HH:MM to begin trading")
     p.add_argument("--entry-buffer-pct", nargs="+", type=float, default=[0.001, 0.002], help="Band buffer pct list (0.001 = 0.1%)")
+    p.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count; 1 runs in-process)")
     return p.parse_args()
 
 
-def maybe_clip(df: pd.DataFrame, start: str | None, end: str | None) -> pd.DataFrame:
-    idx_tz = df.index.tz
-    if start:
-        s = pd.to_datetime(start)
-        if idx_tz and s.tzinfo is None:
-            s = s.tz_localize(idx_tz)
-        elif idx_tz and s.tzinfo is not None:
-            s = s.tz_convert(idx_tz)
-        df = df[df.index >= s]
-    if end:
-        e = pd.to_datetime(end)
-        if idx_tz and e.tzinfo is None:
-            e = e.tz_localize(idx_tz)
-        elif idx_tz and e.tzinfo is not None:
-            e = e.tz_convert(idx_tz)
-        df = df[df.index <= e]
-    return df
+SUMMARY_COLUMNS = ("total_return", "cagr", "sharpe", "max_dd", "alpha", "beta", "hit_ratio")
+
+# Grid-invariant inputs, set once per worker process by `_init_worker` so the
+# large frames are pickled once per worker rather than once per grid cell.
+_GRID_INPUTS: Dict[str, object] = {}
+
+
+def _init_worker(daily: pd.DataFrame, features: pd.DataFrame, bench: pd.Series) -> None:
+    _GRID_INPUTS.update(daily=daily, features=features, bench=bench)
+
+
+def _one(params: Tuple[str, float, float, float]) -> Tuple[float, ...]:
+    """Backtest a single (earliest_entry, vm, sigma_target, entry_buffer) cell; returns metrics in SUMMARY_COLUMNS order."""
+
+    ee, vm, sig, buf = params
+    hh, mm = map(int, ee.split(":"))
+    entry_time = pd.Timestamp.today().replace(hour=hh, minute=mm, second=0, microsecond=0).time()
+    cfg = BacktesterConfig(
+        volatility_multiplier=vm,
+        target_daily_vol=sig,
+        earliest_entry_time=entry_time,
+        entry_buffer_pct=buf,
+    )
+    bt = Backtester(cfg)
+    # With precomputed features the raw bars aren't read, so they're never shipped to the workers.
+    features = _GRID_INPUTS["features"]
+    res = bt.run(features, _GRID_INPUTS["daily"], features=features)
+    summary = summarize_equity(res.equity, _GRID_INPUTS["bench"])
+    return (
+        summary.total_return,
+        summary.cagr,
+        summary.sharpe,
+        summary.max_drawdown,
+        summary.alpha,
+        summary.beta,
+        summary.hit_ratio,
+    )
 
 
 def run_grid(
@@ -63,40 +87,35 @@ def run_grid(
     sigma_targets: Iterable[float],
     earliest_entries: Iterable[str],
     entry_buffers: Iterable[float],
+    workers: Optional[int] = None,
 ) -> pd.DataFrame:
-    rows = []
-    for ee in earliest_entries:
-        hh, mm = map(int, ee.split(":"))
-        entry_time = pd.Timestamp.today().replace(hour=hh, minute=mm, second=0, microsecond=0).time()
-        for vm in vms:
-            for sig in sigma_targets:
-                for buf in entry_buffers:
-                    cfg = BacktesterConfig(
-                        volatility_multiplier=vm,
-                        target_daily_vol=sig,
-                        earliest_entry_time=entry_time,
-                        entry_buffer_pct=buf,
-                    )
-                    bt = Backtester(cfg)
-                    res = bt.run(intraday, daily)
-                    bench = daily["close"].pct_change().dropna()
-                    summary = summarize_equity(res.equity, bench)
-                    rows.append(
-                        {
-                            "earliest_entry": ee,
-                            "entry_buffer": buf,
-                            "vm": vm,
-                            "sigma_target": sig,
-                            "total_return": summary.total_return,
-                            "cagr": summary.cagr,
-                            "sharpe": summary.sharpe,
-                            "max_dd": summary.max_drawdown,
-                            "alpha": summary.alpha,
-                            "beta": summary.beta,
-                            "hit_ratio": summary.hit_ratio,
-                        }
-                    )
-    return pd.DataFrame(rows)
+    # Everything below is invariant across the grid; compute it once. Every cell's equity
+    # curve is indexed by the same sessions, so the benchmark is aligned to them up front.
+    features = prepare_features(intraday, lookback_days=BacktesterConfig().lookback_days)
+    sessions = pd.DatetimeIndex(features["session"].unique())
+    bench = compute_benchmark_returns(daily, index=sessions)
+
+    params = list(itertools.product(earliest_entries, vms, sigma_targets, entry_buffers))
+    metrics = np.empty((len(params), len(SUMMARY_COLUMNS)), dtype=np.float64)
+    init_args = (daily, features, bench)
+    if workers == 1:
+        _init_worker(*init_args)
+        for i, p in enumerate(params):
+            metrics[i] = _one(p)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=init_args) as ex:
+            for i, row in enumerate(ex.map(_one, params)):
+                metrics[i] = row
+
+    # Build the table column-wise from typed arrays rather than inferring dtypes from row dicts.
+    columns = {
+        "earliest_entry": np.array([p[0] for p in params], dtype=object),
+        "entry_buffer": np.array([p[3] for p in params], dtype=np.float64),
+        "vm": np.array([p[1] for p in params], dtype=np.float64),
+        "sigma_target": np.array([p[2] for p in params], dtype=np.float64),
+    }
+    columns.update((name, metrics[:, j]) for j, name in enumerate(SUMMARY_COLUMNS))
+    return pd.DataFrame(columns)
 
 
 def main() -> int:
@@ -105,10 +124,12 @@ def main() -> int:
     daily = load_daily(args.daily)
 
     if args.start or args.end:
-        intraday = maybe_clip(intraday, args.start, args.end)
-        daily = maybe_clip(daily, args.start, args.end)
+        intraday = clip_date_range(intraday, args.start, args.end)
+        daily = clip_date_range(daily, args.start, args.end)
 
-    df = run_grid(intraday, daily, args.vm, args.sigma_target, args.earliest_entry, args.entry_buffer_pct)
+    df = run_grid(
+        intraday, daily, args.vm, args.sigma_target, args.earliest_entry, args.entry_buffer_pct, workers=args.workers
+    )
     df = df.sort_values(["sharpe", "total_return"], ascending=False)
     print(df.to_string(index=False, float_format=lambda x: f"{x:.4f}"))
     best = df.iloc[0]
@@ -16,16 +16,14 @@ import datetime as dt
 from pathlib import Path
 import sys
 
-import pandas as pd
-
 # Allow running as a script without installing the package
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from src.analytics import monthly_returns, summarize_equity  # noqa: E402
+from src.analytics import compute_benchmark_returns, monthly_returns, summarize_equity  # noqa: E402
 from src.backtester import Backtester, BacktesterConfig  # noqa: E402
-from src.data_loader import load_daily, load_intraday  # noqa: E402
+from src.data_loader import clip_date_range, load_daily, load_intraday  # noqa: E402
 
 
 def parse_args() -> argparse.Namespace:
@@ -41,33 +39,14 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-def maybe_clip(df: pd.DataFrame, start: str | None, end: str | None) -> pd.DataFrame:
-    idx_tz = df.index.tz
-    if start:
-        s = pd.to_datetime(start)
-        if idx_tz and s.tzinfo is None:
-            s = s.tz_localize(idx_tz)
-        elif idx_tz and s.tzinfo is not None:
-            s = s.tz_convert(idx_tz)
-        df = df[df.index >= s]
-    if end:
-        e = pd.to_datetime(end)
-        if idx_tz and e.tzinfo is None:
-            e = e.tz_localize(idx_tz)
-        elif idx_tz and e.tzinfo is not None:
-            e = e.tz_convert(idx_tz)
-        df = df[df.index <= e]
-    return df
-
-
 def main() -> int:
     args = parse_args()
     intraday = load_intraday(args.intraday)
     daily = load_daily(args.daily)
 
     if args.start or args.end:
-        intraday = maybe_clip(intraday, args.start, args.end)
-        daily = maybe_clip(daily, args.start, args.end)
+        intraday = clip_date_range(intraday, args.start, args.end)
+        daily = clip_date_range(daily, args.start, args.end)
 
     hh, mm = map(int, args.earliest_entry.split(":"))
     cfg = BacktesterConfig(
@@ -77,8 +56,8 @@ def main() -> int:
     bt = Backtester(cfg)
     result = bt.run(intraday, daily)
 
-    # Benchmark: daily SPY returns
-    benchmark_returns = daily["close"].pct_change().dropna()
+    # Benchmark: daily SPY returns, aligned to the equity dates once so alpha/beta can skip the join
+    benchmark_returns = compute_benchmark_returns(daily, index=result.equity.index)
 
     summary = summarize_equity(result.equity, benchmark_returns)
     mret = monthly_returns(result.equity["equity_end"] / result.equity["equity_start"] - 1)
@@ -3,14 +3,29 @@ from __future__ import annotations
 
 import math
 from dataclasses import dataclass
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
+from numba import njit
 
 
 DEFAULT_PERIODS_PER_YEAR = 252  # daily observations
 
+# Metrics accept Series or arrays; both are reduced as contiguous float64 arrays.
+ArrayLike = Union[pd.Series, np.ndarray]
+
+
+def _as_float_array(values: ArrayLike) -> np.ndarray:
+    if isinstance(values, pd.Series):
+        return values.to_numpy(dtype=np.float64, copy=False)
+    return np.asarray(values, dtype=np.float64)
+
+
+def _sample_var(values: np.ndarray) -> float:
+    """Sample variance (ddof=1); NaN for fewer than two observations, like pandas."""
+    return float(np.var(values, ddof=1)) if values.size > 1 else math.nan
+
 
 def daily_returns_from_equity(equity: pd.DataFrame) -> pd.Series:
     """Compute daily returns from equity_start/equity_end columns."""
@@ -18,26 +33,128 @@ def daily_returns_from_equity(equity: pd.DataFrame) -> pd.Series:
     return ret.dropna()
 
 
-def annualized_return(returns: pd.Series, periods_per_year: int = DEFAULT_PERIODS_PER_YEAR) -> float:
-    compounded = (1 + returns).prod()
-    years = len(returns) / periods_per_year
-    return compounded ** (1 / max(years, 1e-9)) - 1
+def compute_benchmark_returns(daily: pd.DataFrame, index: Optional[pd.Index] = None) -> pd.Series:
+    """
+    Daily close-to-close benchmark returns as float64.
+
+    Compute once per run and pass it around. When `index` is given (typically the
+    equity dates) the returns are reindexed to it so `alpha_beta` can skip the join.
+    """
+    bench = daily["close"].pct_change().dropna().astype(np.float64)
+    return bench if index is None else bench.reindex(index)
+
+
+@njit(cache=True, error_model="numpy")
+def _growth_step(r: float, log_abs: float, n_negative: int, has_zero: bool) -> Tuple[float, int, bool]:
+    """Fold one return into the running |prod(1 + r)| (in log space) and its sign/zero flags."""
+    g = 1.0 + r
+    if g > 0:
+        log_abs += np.log1p(r)
+    elif g < 0:
+        log_abs += np.log(-g)
+        n_negative += 1
+    else:
+        has_zero = True
+    return log_abs, n_negative, has_zero
+
+
+@njit(cache=True, error_model="numpy")
+def _annualize_growth(log_abs: float, n_negative: int, has_zero: bool, n: int, periods_per_year: float) -> float:
+    """
+    prod(1 + r) ** (ppy / n) - 1 from the accumulated growth of `n` periods.
+
+    A positive growth factor is annualized in log space so long histories don't overflow;
+    a zero or negative one (a period below -100%) uses the plain power, as the pandas
+    original did: -1 for zero growth, NaN or a sign-dependent value for negative growth.
+    """
+    if n == 0:
+        return 0.0
+    years = max(n / periods_per_year, 1e-9)
+    if not has_zero and n_negative % 2 == 0:
+        return np.expm1(log_abs / years)
+    growth = 0.0 if has_zero else -np.exp(log_abs)
+    return growth ** (1.0 / years) - 1.0
+
+
+@njit(cache=True)
+def _log_growth(r: np.ndarray) -> Tuple[float, int, bool]:
+    log_abs = 0.0
+    n_negative = 0
+    has_zero = False
+    for x in r:
+        log_abs, n_negative, has_zero = _growth_step(x, log_abs, n_negative, has_zero)
+    return log_abs, n_negative, has_zero
+
+
+def annualized_return(returns: ArrayLike, periods_per_year: int = DEFAULT_PERIODS_PER_YEAR) -> float:
+    r = _as_float_array(returns)
+    # NaN returns are skipped in the product but still count towards the years, as in pandas.
+    valid = r[~np.isnan(r)]
+    return float(_annualize_growth(*_log_growth(valid), r.size, float(periods_per_year)))
+
 
+def annualized_volatility(returns: ArrayLike, periods_per_year: int = DEFAULT_PERIODS_PER_YEAR) -> float:
+    r = _as_float_array(returns)
+    return math.sqrt(_sample_var(r[~np.isnan(r)])) * math.sqrt(periods_per_year)
 
-def annualized_volatility(returns: pd.Series, periods_per_year: int = DEFAULT_PERIODS_PER_YEAR) -> float:
-    return returns.std() * math.sqrt(periods_per_year)
 
+def sharpe_ratio(returns: ArrayLike, rf_rate: float = 0.0, periods_per_year: int = DEFAULT_PERIODS_PER_YEAR) -> float:
+    r = _as_float_array(returns)
+    r = r[~np.isnan(r)]  # skipna, like Series.mean/std
+    if r.size < 2:
+        return math.nan
+    # Subtracting a constant rf doesn't change the std, so reduce the raw returns directly.
+    vol = r.std(ddof=1) * math.sqrt(periods_per_year)
+    return float((r.mean() - rf_rate / periods_per_year) / vol) if vol != 0 else 0.0
 
-def sharpe_ratio(returns: pd.Series, rf_rate: float = 0.0, periods_per_year: int = DEFAULT_PERIODS_PER_YEAR) -> float:
-    excess = returns - (rf_rate / periods_per_year)
-    vol = annualized_volatility(excess, periods_per_year)
-    return excess.mean() / vol if vol != 0 else 0.0
 
+@njit(cache=True, error_model="numpy")
+def _max_drawdown_kernel(e: np.ndarray) -> float:
+    """
+    Single pass holding the running peak and worst drawdown; no intermediate arrays.
 
-def max_drawdown(equity_curve: pd.Series) -> float:
-    running_max = equity_curve.cummax()
-    drawdown = equity_curve / running_max - 1
-    return drawdown.min()
+    Matches (e / e.cummax() - 1).min(): NaN values are skipped, a zero peak yields
+    NaN/inf instead of raising, and the result is NaN when no drawdown is defined.
+    """
+    peak = np.nan
+    worst = np.nan
+    for x in e:
+        if np.isnan(x):
+            continue
+        if np.isnan(peak) or x > peak:
+            peak = x
+        dd = x / peak - 1.0
+        if dd < worst or (np.isnan(worst) and not np.isnan(dd)):
+            worst = dd
+    return worst
+
+
+@njit(cache=True)
+def _regression_moments(s: np.ndarray, b: np.ndarray) -> Tuple[float, float, float, float]:
+    """One-pass Welford means, sample covariance and sample benchmark variance (NaN if n < 2)."""
+    mean_s = 0.0
+    mean_b = 0.0
+    co = 0.0
+    m2_b = 0.0
+    n = 0
+    for i in range(s.size):
+        n += 1
+        ds = s[i] - mean_s
+        db = b[i] - mean_b
+        mean_s += ds / n
+        mean_b += db / n
+        co += ds * (b[i] - mean_b)
+        m2_b += db * (b[i] - mean_b)
+    if n < 2:
+        return mean_s, mean_b, np.nan, np.nan
+    return mean_s, mean_b, co / (n - 1), m2_b / (n - 1)
+
+
+def max_drawdown(equity_curve: ArrayLike) -> float:
+    e = _as_float_array(equity_curve)
+    if e.size == 0:
+        return math.nan
+    return float(_max_drawdown_kernel(e))
 
 
 def alpha_beta(
@@ -46,16 +163,32 @@ def alpha_beta(
     periods_per_year: int = DEFAULT_PERIODS_PER_YEAR,
     rf_rate: float = 0.0,
 ) -> Tuple[float, float]:
-    """Compute CAPM alpha/beta vs benchmark using simple linear regression."""
-    aligned = pd.concat([strategy_returns, benchmark_returns], axis=1, join="inner").dropna()
-    if aligned.empty or aligned.iloc[:, 1].var() == 0:
+    """
+    Compute CAPM alpha/beta vs benchmark using simple linear regression.
+
+    When both series share the same index (e.g. the benchmark was reindexed to the
+    equity dates up front) the inner join is skipped and only NaN pairs are dropped.
+    """
+    if strategy_returns.index.equals(benchmark_returns.index):
+        strat = _as_float_array(strategy_returns)
+        bench = _as_float_array(benchmark_returns)
+        valid = ~(np.isnan(strat) | np.isnan(bench))
+        strat, bench = strat[valid], bench[valid]
+    else:
+        aligned = pd.concat([strategy_returns, benchmark_returns], axis=1, join="inner").dropna()
+        strat = aligned.iloc[:, 0].to_numpy(dtype=np.float64)
+        bench = aligned.iloc[:, 1].to_numpy(dtype=np.float64)
+    if strat.size == 0:
         return 0.0, 0.0
 
-    strat = aligned.iloc[:, 0] - (rf_rate / periods_per_year)
-    bench = aligned.iloc[:, 1] - (rf_rate / periods_per_year)
+    strat = strat - (rf_rate / periods_per_year)
+    bench = bench - (rf_rate / periods_per_year)
 
-    beta = strat.cov(bench) / bench.var()
-    alpha_daily = strat.mean() - beta * bench.mean()
+    mean_s, mean_b, cov, var_b = _regression_moments(strat, bench)
+    if var_b == 0:
+        return 0.0, 0.0
+    beta = cov / var_b
+    alpha_daily = mean_s - beta * mean_b
     alpha_annual = alpha_daily * periods_per_year
     return alpha_annual, beta
 
@@ -65,11 +198,12 @@ def monthly_returns(returns: pd.Series) -> pd.Series:
     return returns.add(1).resample("M").prod().sub(1)
 
 
-def hit_ratio(returns: pd.Series) -> float:
-    return (returns > 0).mean() if len(returns) else 0.0
+def hit_ratio(returns: ArrayLike) -> float:
+    r = _as_float_array(returns)
+    return float(np.count_nonzero(r > 0) / r.size) if r.size else 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class PerformanceSummary:
     cagr: float
     sharpe: float
@@ -80,27 +214,106 @@ class PerformanceSummary:
     hit_ratio: float
 
 
+@njit(cache=True, error_model="numpy")
+def _fused_summary(
+    equity_start: np.ndarray,
+    equity_end: np.ndarray,
+    bench: np.ndarray,
+    has_bench: bool,
+    periods_per_year: float,
+    rf_per_period: float,
+) -> Tuple[float, float, float, float, float, float, float]:
+    """
+    All `PerformanceSummary` metrics in one sweep over the equity rows.
+
+    Daily returns are derived in-loop (NaN returns skipped, as `daily_returns_from_equity`
+    drops them); `bench` must be aligned row-for-row with the equity frame. Accumulates
+    the growth factor (with `annualized_return`'s `_growth_step`), Welford moments of the
+    returns and of the (return, benchmark) pairs, the hit count and the running drawdown,
+    with the same edge cases as the standalone metric functions; zero equity divides to
+    inf/NaN rather than raising.
+    """
+    n_rows = equity_end.size
+    log_abs = 0.0
+    n_negative = 0
+    has_zero = False
+    n = 0
+    mean_r = 0.0
+    m2_r = 0.0
+    hits = 0
+    m = 0
+    mean_s = 0.0
+    mean_b = 0.0
+    co = 0.0
+    m2_b = 0.0
+    peak = np.nan
+    worst = np.nan
+    for i in range(n_rows):
+        x = equity_end[i]
+        if not np.isnan(x):
+            if np.isnan(peak) or x > peak:
+                peak = x
+            dd = x / peak - 1.0
+            if dd < worst or (np.isnan(worst) and not np.isnan(dd)):
+                worst = dd
+
+        r = x / equity_start[i] - 1.0
+        if np.isnan(r):
+            continue
+        n += 1
+        log_abs, n_negative, has_zero = _growth_step(r, log_abs, n_negative, has_zero)
+        d = r - mean_r
+        mean_r += d / n
+        m2_r += d * (r - mean_r)
+        if r > 0:
+            hits += 1
+
+        if has_bench and not np.isnan(bench[i]):
+            m += 1
+            ds = r - mean_s
+            db = bench[i] - mean_b
+            mean_s += ds / m
+            mean_b += db / m
+            co += ds * (bench[i] - mean_b)
+            m2_b += db * (bench[i] - mean_b)
+
+    cagr = _annualize_growth(log_abs, n_negative, has_zero, n, periods_per_year)
+    sharpe = np.nan
+    if n > 1:
+        vol = np.sqrt(m2_r / (n - 1)) * np.sqrt(periods_per_year)
+        sharpe = (mean_r - rf_per_period) / vol if vol != 0 else 0.0
+    max_dd = worst
+    total_return = equity_end[-1] / equity_end[0] - 1.0 if n_rows > 1 else 0.0
+
+    alpha = 0.0
+    beta = 0.0
+    if m == 1:
+        alpha = np.nan
+        beta = np.nan
+    elif m > 1 and m2_b != 0:
+        beta = co / m2_b
+        alpha = ((mean_s - rf_per_period) - beta * (mean_b - rf_per_period)) * periods_per_year
+    hit = hits / n if n else 0.0
+    return cagr, sharpe, max_dd, total_return, alpha, beta, hit
+
+
 def summarize_equity(
     equity: pd.DataFrame,
     benchmark_returns: Optional[pd.Series] = None,
     periods_per_year: int = DEFAULT_PERIODS_PER_YEAR,
     rf_rate: float = 0.0,
 ) -> PerformanceSummary:
-    returns = daily_returns_from_equity(equity)
-    equity_curve = equity["equity_end"]
-
-    alpha_val, beta_val = (0.0, 0.0)
-    if benchmark_returns is not None:
-        alpha_val, beta_val = alpha_beta(returns, benchmark_returns, periods_per_year, rf_rate)
-
-    total_return = equity_curve.iloc[-1] / equity_curve.iloc[0] - 1 if len(equity_curve) > 1 else 0.0
-    summary = PerformanceSummary(
-        cagr=annualized_return(returns, periods_per_year),
-        sharpe=sharpe_ratio(returns, rf_rate=rf_rate, periods_per_year=periods_per_year),
-        max_drawdown=max_drawdown(equity_curve),
-        total_return=total_return,
-        alpha=alpha_val,
-        beta=beta_val,
-        hit_ratio=hit_ratio(returns),
+    start = equity["equity_start"].to_numpy(dtype=np.float64, copy=False)
+    end = equity["equity_end"].to_numpy(dtype=np.float64, copy=False)
+
+    if benchmark_returns is None:
+        bench = np.empty(0, dtype=np.float64)
+    elif benchmark_returns.index.equals(equity.index):
+        bench = _as_float_array(benchmark_returns)
+    else:
+        bench = benchmark_returns.reindex(equity.index).to_numpy(dtype=np.float64)
+
+    metrics = _fused_summary(
+        start, end, bench, benchmark_returns is not None, float(periods_per_year), rf_rate / periods_per_year
     )
-    return summary
+    return PerformanceSummary(*(float(v) for v in metrics))
@@ -2,14 +2,26 @@
 from __future__ import annotations
 
 import datetime as dt
+import os
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import List, Optional, Sequence
+from functools import partial
+from typing import List, Optional, Sequence, Tuple
 
 import numpy as np
 import pandas as pd
+from numba import njit
 
-from .noise_area import compute_noise_bands
-from .vwap import intraday_vwap
+from .data_loader import NS_PER_DAY, session_codes, session_starts
+from .noise_area import (
+    compute_time_of_day_sigma,
+    gap_adjusted_bands,
+    previous_session_close,
+    rolling_std,
+    session_first_open,
+    simple_returns,
+)
+from .vwap import running_vwap
 
 
 RTH_START = dt.time(9, 30)
@@ -28,6 +40,7 @@ class BacktesterConfig:
     decision_minutes: Sequence[int] = (0, 30)  # HH:00 and HH:30
     earliest_entry_time: dt.time = dt.time(10, 0)  # skip opening chop by default
     entry_buffer_pct: float = 0.001  # require price to clear band by 0.1%
+    n_jobs: Optional[int] = 1  # processes for the per-session trade pass; None = CPU count
 
 
 @dataclass
@@ -50,191 +63,438 @@ class BacktestResult:
     equity: pd.DataFrame
 
 
-def _filter_rth(df: pd.DataFrame) -> pd.DataFrame:
-    mask = (df.index.time >= RTH_START) & (df.index.time <= RTH_END)
-    return df.loc[mask].copy()
-
+# Trade records written by `_run_session`: bars are global row positions, `side` is +1 / -1
+# and `exit_reason` indexes EXIT_REASONS; `_trades_frame` decodes them into `Trade` columns.
+TRADE_RECORD = np.dtype(
+    [
+        ("entry_row", np.int64),
+        ("exit_row", np.int64),
+        ("side", np.int8),
+        ("shares", np.float64),
+        ("entry_price", np.float64),
+        ("exit_price", np.float64),
+        ("gross_pnl", np.float64),
+        ("costs", np.float64),
+        ("net_pnl", np.float64),
+        ("exit_reason", np.int8),
+    ]
+)
+EXIT_REASONS = ("stop", "reverse", "band_exit", "eod")
 
-def _add_session_columns(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
-    df["session"] = pd.to_datetime(df.index.date)
-    df["time"] = df.index.strftime("%H:%M")
-    df["session_open"] = df.groupby("session")["open"].transform("first")
-    return df
 
-
-def _prepare_intraday(df: pd.DataFrame, cfg: BacktesterConfig) -> pd.DataFrame:
-    filtered = _filter_rth(df).sort_index()
-    bands = compute_noise_bands(filtered, lookback_days=cfg.lookback_days, volatility_multiplier=cfg.volatility_multiplier)
-    with_bands = filtered.join(bands)
-    with_bands = _add_session_columns(with_bands)
-    with_vwap = intraday_vwap(with_bands)
-    with_vwap["session"] = pd.to_datetime(with_vwap["session"])
-    return with_vwap
+def _filter_rth(df: pd.DataFrame) -> pd.DataFrame:
+    mask = (df.index.time >= RTH_START) & (df.index.time <= RTH_END)
+    return df.loc[mask]
+
+
+def _session_columns(df: pd.DataFrame, codes: np.ndarray) -> dict:
+    return {
+        "session": pd.to_datetime(codes, unit="D"),
+        "session_open": session_first_open(codes, df["open"].to_numpy(dtype=np.float64)),
+    }
+
+
+def prepare_features(intraday: pd.DataFrame, lookback_days: int = 14) -> pd.DataFrame:
+    """
+    Compute the per-bar features that do not depend on the trading parameters.
+
+    Session columns, VWAP, time-of-day sigma and the previous session close only
+    depend on the bars and `lookback_days`; compute them once and pass the result
+    to `Backtester.run(..., features=...)` when sweeping other parameters.
+    """
+
+    filtered = _filter_rth(intraday).sort_index()
+    codes = session_codes(filtered.index)
+    starts = session_starts(filtered.index)
+    columns = {name: filtered[name] for name in filtered.columns}
+    columns["sigma"] = compute_time_of_day_sigma(filtered, lookback_days=lookback_days)
+    columns.update(_session_columns(filtered, codes))
+    features = pd.DataFrame(columns, index=filtered.index, copy=False)
+    features["prev_close"] = previous_session_close(features)
+    features["vwap"] = running_vwap(
+        filtered["close"].to_numpy(dtype=np.float64), filtered["volume"].to_numpy(dtype=np.float64), starts
+    )
+    features.attrs["lookback_days"] = lookback_days
+    return features
+
+
+def _prepare_intraday(df: pd.DataFrame, cfg: BacktesterConfig, features: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    if features is None:
+        features = prepare_features(df, lookback_days=cfg.lookback_days)
+    elif features.attrs.get("lookback_days") != cfg.lookback_days:
+        raise ValueError(
+            f"features were prepared with lookback_days={features.attrs.get('lookback_days')}, "
+            f"config has {cfg.lookback_days}"
+        )
+    if not features.index.is_monotonic_increasing:
+        raise ValueError("features must be sorted by timestamp, as returned by prepare_features")
+    # Only HH:MM:00 bars at the configured decision minutes can stop, enter or flip a position.
+    # Minutes fit in int8, so the membership test runs on a compact array rather than an Index.
+    index = features.index
+    decision = np.isin(index.minute.to_numpy(dtype=np.int8), np.asarray(cfg.decision_minutes, dtype=np.int8)) & (
+        index.second.to_numpy() == 0
+    )
+    # Bands are only ever read at decision bars, so only those rows are computed; the rest stay NaN.
+    rows = np.flatnonzero(decision)
+    bands = gap_adjusted_bands(
+        features["session_open"].to_numpy(dtype=np.float64)[rows],
+        features["prev_close"].to_numpy(dtype=np.float64)[rows],
+        features["sigma"].to_numpy(dtype=np.float64)[rows],
+        cfg.volatility_multiplier,
+    )
+    upper = np.full(len(index), np.nan)
+    lower = np.full(len(index), np.nan)
+    upper[rows] = bands["upper"].to_numpy()
+    lower[rows] = bands["lower"].to_numpy()
+    # Only the columns the session loop reads, referenced rather than copied from `features`.
+    return pd.DataFrame(
+        {
+            "session": features["session"],
+            "session_open": features["session_open"],
+            "close": features["close"],
+            "vwap": features["vwap"],
+            "upper": upper,
+            "lower": lower,
+            "decision": decision,
+        },
+        index=index,
+        copy=False,
+    )
+
+
+def _time_of_day_ns(t: dt.time) -> int:
+    return ((t.hour * 60 + t.minute) * 60 + t.second) * 1_000_000_000 + t.microsecond * 1_000
+
+
+@njit(cache=True)
+def _record_trade(
+    out: np.ndarray,
+    k: int,
+    entry_row: int,
+    exit_row: int,
+    side: int,
+    shares: float,
+    entry_price: float,
+    exit_price: float,
+    per_share_cost: float,
+    reason: int,
+) -> float:
+    """Write trade `k` into `out` and return its net P&L."""
+    if side > 0:
+        gross = (exit_price - entry_price) * shares
+    else:
+        gross = (entry_price - exit_price) * shares
+    costs = per_share_cost * shares
+    net = gross - costs
+    rec = out[k]
+    rec.entry_row = entry_row
+    rec.exit_row = exit_row
+    rec.side = side
+    rec.shares = shares
+    rec.entry_price = entry_price
+    rec.exit_price = exit_price
+    rec.gross_pnl = gross
+    rec.costs = costs
+    rec.net_pnl = net
+    rec.exit_reason = reason
+    return net
+
+
+@njit(cache=True)
+def _run_session(
+    rows: np.ndarray,
+    close: np.ndarray,
+    upper: np.ndarray,
+    lower: np.ndarray,
+    vwap: np.ndarray,
+    last_row: int,
+    last_close: float,
+    shares: float,
+    per_share_cost: float,
+    entry_buffer_pct: float,
+) -> Tuple[np.ndarray, float]:
+    """
+    Run one session's stop / entry / flip state machine over its actionable decision bars.
+
+    `rows` are the bars' global positions, recorded as entry/exit rows; an open position is
+    closed at (`last_row`, `last_close`). Returns the trade records and the session's net P&L.
+    """
+    # Each bar closes at most one trade (a stop leaves nothing to flip), plus the end-of-day exit.
+    out = np.empty(len(rows) + 1, dtype=TRADE_RECORD)
+    n = 0
+    pnl = 0.0
+    pos = 0  # +1 long, -1 short, 0 flat
+    entry_price = 0.0
+    entry_row = -1
+    for i in range(len(rows)):
+        price = close[i]
+
+        # Trailing stop check at decision times
+        if pos > 0:
+            stop = vwap[i] if vwap[i] > upper[i] else upper[i]
+            if price <= stop:
+                pnl += _record_trade(out, n, entry_row, rows[i], pos, shares, entry_price, price, per_share_cost, 0)
+                n += 1
+                pos = 0
+        elif pos < 0:
+            stop = vwap[i] if vwap[i] < lower[i] else lower[i]
+            if price >= stop:
+                pnl += _record_trade(out, n, entry_row, rows[i], pos, shares, entry_price, price, per_share_cost, 0)
+                n += 1
+                pos = 0
+
+        # Entry / flip logic
+        if price > upper[i] * (1 + entry_buffer_pct):
+            desired_pos = 1
+        elif price < lower[i] * (1 - entry_buffer_pct):
+            desired_pos = -1
+        else:
+            desired_pos = 0
+
+        if desired_pos == pos:
+            continue
+
+        # Close existing position if flipping or exiting
+        if pos != 0:
+            reason = 1 if desired_pos != 0 else 2
+            pnl += _record_trade(out, n, entry_row, rows[i], pos, shares, entry_price, price, per_share_cost, reason)
+            n += 1
+            pos = 0
+
+        if desired_pos != 0:
+            pos = desired_pos
+            entry_price = price
+            entry_row = rows[i]
+
+    # End-of-day flat
+    if pos != 0:
+        pnl += _record_trade(out, n, entry_row, last_row, pos, shares, entry_price, last_close, per_share_cost, 3)
+        n += 1
+    return out[:n], pnl
+
+
+def _unit_session_trades(
+    rows: np.ndarray,
+    close: np.ndarray,
+    upper: np.ndarray,
+    lower: np.ndarray,
+    vwap: np.ndarray,
+    bounds: np.ndarray,
+    last_rows: np.ndarray,
+    last_close: np.ndarray,
+    per_share_cost: float,
+    entry_buffer_pct: float,
+) -> List[np.ndarray]:
+    """
+    Trade records of consecutive sessions for a one-share position.
+
+    `rows` and the price arrays hold the sessions' actionable bars back to back; session `s`
+    owns `[bounds[s], bounds[s + 1])` and is closed out at `last_rows[s]` / `last_close[s]`.
+    """
+
+    no_trades = np.empty(0, dtype=TRADE_RECORD)
+    out = []
+    for s in range(len(last_rows)):
+        lo, hi = bounds[s], bounds[s + 1]
+        if lo == hi:  # nothing actionable, e.g. the sigma warm-up sessions
+            out.append(no_trades)
+            continue
+        records, _ = _run_session(
+            rows[lo:hi],
+            close[lo:hi],
+            upper[lo:hi],
+            lower[lo:hi],
+            vwap[lo:hi],
+            last_rows[s],
+            last_close[s],
+            1.0,
+            per_share_cost,
+            entry_buffer_pct,
+        )
+        out.append(records)
+    return out
+
+
+@njit(cache=True)
+def _compound_sessions(
+    records: np.ndarray,
+    offsets: np.ndarray,
+    day_open: np.ndarray,
+    vol: np.ndarray,
+    initial_capital: float,
+    target_daily_vol: float,
+    max_leverage: float,
+    per_share_cost: float,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Size each session from the capital compounded so far and scale its one-share trades.
+
+    Session `s` owns `records[offsets[s]:offsets[s + 1]]`, which are rescaled in place.
+    Returns per-session starting equity, P&L and shares, plus a mask of the trades kept
+    (sessions without a usable vol estimate are not traded).
+    """
+    n = len(day_open)
+    equity_start = np.empty(n)
+    pnl = np.empty(n)
+    shares = np.empty(n)
+    keep = np.ones(len(records), dtype=np.bool_)
+    capital = initial_capital
+    for s in range(n):
+        equity_start[s] = capital
+        v = vol[s]
+        if np.isnan(v) or v <= 0:
+            sh = 0.0
+        else:
+            leverage = target_daily_vol / v
+            if not leverage < max_leverage:
+                leverage = max_leverage
+            sh = capital * leverage / day_open[s]
+        shares[s] = sh
+
+        day_pnl = 0.0
+        for k in range(offsets[s], offsets[s + 1]):
+            if sh == 0:
+                keep[k] = False
+                continue
+            rec = records[k]
+            gross = rec.gross_pnl * sh
+            costs = per_share_cost * sh
+            net = gross - costs
+            rec.shares = sh
+            rec.gross_pnl = gross
+            rec.costs = costs
+            rec.net_pnl = net
+            day_pnl += net
+        pnl[s] = day_pnl
+        capital += day_pnl
+    return equity_start, pnl, shares, keep
+
+
+def _trades_frame(records: np.ndarray, index: pd.DatetimeIndex) -> pd.DataFrame:
+    """Materialize `_run_session` records into a frame with one column per `Trade` field."""
+
+    reasons = np.asarray(EXIT_REASONS, dtype=object)
+    return pd.DataFrame(
+        {
+            "entry_time": index[records["entry_row"]],
+            "exit_time": index[records["exit_row"]],
+            "side": np.where(records["side"] > 0, "LONG", "SHORT").astype(object),
+            "shares": records["shares"],
+            "entry_price": records["entry_price"],
+            "exit_price": records["exit_price"],
+            "gross_pnl": records["gross_pnl"],
+            "costs": records["costs"],
+            "net_pnl": records["net_pnl"],
+            "exit_reason": reasons[records["exit_reason"]],
+        }
+    )
 
 
 def _compute_daily_vol(daily: pd.DataFrame, lookback: int = 14) -> pd.Series:
     daily_sorted = daily.sort_index()
-    ret = daily_sorted["close"].pct_change()
-    vol = ret.rolling(window=lookback, min_periods=lookback).std()
-    return vol
+    close = daily_sorted["close"].to_numpy(dtype=np.float64)
+    vol = rolling_std(simple_returns(close), lookback)
+    return pd.Series(vol, index=daily_sorted.index, name="close")
 
 
 class Backtester:
     def __init__(self, config: Optional[BacktesterConfig] = None):
         self.config = config or BacktesterConfig()
 
-    def _calc_shares(self, capital: float, day_open: float, vol: float) -> float:
-        if np.isnan(vol) or vol <= 0:
-            return 0.0
-        leverage = min(self.config.max_leverage, self.config.target_daily_vol / vol)
-        return capital * leverage / day_open
+    def run(self, intraday: pd.DataFrame, daily: pd.DataFrame, features: Optional[pd.DataFrame] = None) -> BacktestResult:
+        """
+        Backtest the strategy over `intraday` bars using `daily` bars for volatility sizing.
 
-    def run(self, intraday: pd.DataFrame, daily: pd.DataFrame) -> BacktestResult:
-        df = _prepare_intraday(intraday, self.config)
+        `features` may be a precomputed `prepare_features(intraday, cfg.lookback_days)` frame;
+        pass it when running several configurations over the same bars. When it is given,
+        `intraday` is ignored and the bars are read from `features` instead.
+        """
+
+        cfg = self.config
+        df = _prepare_intraday(intraday, cfg, features)
         daily_vol = _compute_daily_vol(daily)
         daily_vol = daily_vol.shift(1)  # use prior-day vol estimate
-
-        capital = self.config.initial_capital
-        trades: List[Trade] = []
-        equity_rows: List[dict] = []
-
-        sessions = df["session"].drop_duplicates().sort_values()
-
-        for session in sessions:
-            session_df = df[df["session"] == session]
-            if session_df.empty:
-                continue
-
-            day_open = session_df["session_open"].iloc[0]
-            vol_est = daily_vol.get(session, np.nan)
-            shares_today = self._calc_shares(capital, day_open, vol_est)
-            if shares_today == 0:
-                equity_rows.append(
-                    {
-                        "date": session,
-                        "equity_start": capital,
-                        "daily_pnl": 0.0,
-                        "equity_end": capital,
-                        "vol_est": vol_est,
-                        "shares": shares_today,
-                    }
-                )
-                continue
-
-            pos = 0  # +1 long, -1 short, 0 flat
-            entry_price = None
-            entry_time = None
-            daily_pnl = 0.0
-            session_df = session_df.sort_index()
-            last_row = session_df.iloc[-1]
-
-            for ts, row in session_df.iterrows():
-                if ts.time() < self.config.earliest_entry_time:
-                    continue
-
-                price = row["close"]
-                upper = row["upper"]
-                lower = row["lower"]
-                vwap = row["vwap"]
-
-                if pd.isna(upper) or pd.isna(lower):
-                    continue
-
-                decision_time = ts.minute in self.config.decision_minutes and ts.second == 0
-
-                # Trailing stop check at decision times
-                if pos > 0 and decision_time:
-                    stop = max(upper, vwap)
-                    if price <= stop:
-                        gross, costs, net = self._close_trade(entry_price, price, shares_today, side="LONG")
-                        trades.append(
-                            Trade(entry_time, ts, "LONG", shares_today, entry_price, price, gross, costs, net, "stop")
-                        )
-                        daily_pnl += net
-                        pos = 0
-                        entry_price = None
-                        entry_time = None
-                elif pos < 0 and decision_time:
-                    stop = min(lower, vwap)
-                    if price >= stop:
-                        gross, costs, net = self._close_trade(entry_price, price, shares_today, side="SHORT")
-                        trades.append(
-                            Trade(entry_time, ts, "SHORT", shares_today, entry_price, price, gross, costs, net, "stop")
-                        )
-                        daily_pnl += net
-                        pos = 0
-                        entry_price = None
-                        entry_time = None
-
-                if not decision_time:
-                    continue
-
-                # Entry / flip logic
-                desired_pos = pos
-                exit_reason = None
-                upper_buf = upper * (1 + self.config.entry_buffer_pct)
-                lower_buf = lower * (1 - self.config.entry_buffer_pct)
-
-                if price > upper_buf:
-                    desired_pos = 1
-                elif price < lower_buf:
-                    desired_pos = -1
-                else:
-                    desired_pos = 0
-
-                if desired_pos == pos:
-                    continue
-
-                # Close existing position if flipping or exiting
-                if pos != 0:
-                    side = "LONG" if pos > 0 else "SHORT"
-                    reason = "reverse" if desired_pos != 0 else "band_exit"
-                    gross, costs, net = self._close_trade(entry_price, price, shares_today, side=side)
-                    trades.append(
-                        Trade(entry_time, ts, side, shares_today, entry_price, price, gross, costs, net, reason)
-                    )
-                    daily_pnl += net
-                    pos = 0
-                    entry_price = None
-                    entry_time = None
-
-                if desired_pos != 0:
-                    pos = desired_pos
-                    entry_price = price
-                    entry_time = ts
-
-            # End-of-day flat
-            if pos != 0 and entry_price is not None:
-                side = "LONG" if pos > 0 else "SHORT"
-                gross, costs, net = self._close_trade(entry_price, last_row["close"], shares_today, side=side)
-                trades.append(
-                    Trade(entry_time, last_row.name, side, shares_today, entry_price, last_row["close"], gross, costs, net, "eod")
-                )
-                daily_pnl += net
-
-            equity_rows.append(
-                {
-                    "date": session,
-                    "equity_start": capital,
-                    "daily_pnl": daily_pnl,
-                    "equity_end": capital + daily_pnl,
-                    "vol_est": vol_est,
-                    "shares": shares_today,
-                }
+        per_share_cost = (cfg.commission_per_share + cfg.slippage_per_share) * 2  # entry + exit
+
+        index = df.index
+        local = index.tz_localize(None) if index.tz is not None else index
+        local_ns = local.as_unit("ns").asi8
+        close = df["close"].to_numpy(dtype=np.float64)
+        upper = df["upper"].to_numpy(dtype=np.float64)
+        lower = df["lower"].to_numpy(dtype=np.float64)
+        vwap = df["vwap"].to_numpy(dtype=np.float64)
+        session_open = df["session_open"].to_numpy(dtype=np.float64)
+        # Non-decision bars, bars without bands (sigma warm-up) and bars before the earliest
+        # entry time never act, so the session kernel only sees the rest.
+        actionable = (
+            df["decision"].to_numpy()
+            & ~np.isnan(upper)
+            & ~np.isnan(lower)
+            & (local_ns % NS_PER_DAY >= _time_of_day_ns(cfg.earliest_entry_time))
+        )
+
+        # Bars are in time order (checked in _prepare_intraday), so each session is one contiguous
+        # run of positions and is sliced at its start instead of found with a per-session scan.
+        n_bars = len(df)
+        session_key = df["session"].to_numpy()
+        starts = np.flatnonzero(np.r_[True, session_key[1:] != session_key[:-1]]) if n_bars else np.arange(0)
+        sessions = pd.DatetimeIndex(session_key[starts], name="date")
+        ends = np.append(starts[1:], n_bars) if len(starts) else starts
+        last_rows = ends - 1
+
+        # Gather the actionable bars once, in session order; each session's bars are then the
+        # contiguous slice between its bounds, and sessions with none are skipped outright.
+        act_rows = np.flatnonzero(actionable)
+        act_bounds = np.append(0, np.cumsum(actionable))[np.append(starts, n_bars)]
+        unit_args = (act_rows, close[act_rows], upper[act_rows], lower[act_rows], vwap[act_rows])
+
+        # Pass 1: which trades happen doesn't depend on position size, and P&L is linear in
+        # shares, so each session is simulated for one share, optionally in parallel.
+        if cfg.n_jobs == 1 or len(sessions) < 2:
+            session_records = _unit_session_trades(
+                *unit_args, act_bounds, last_rows, close[last_rows], per_share_cost, cfg.entry_buffer_pct
             )
-            capital += daily_pnl
-
-        trades_df = pd.DataFrame(trades)
-        equity_df = pd.DataFrame(equity_rows).set_index("date")
-        return BacktestResult(trades=trades_df, equity=equity_df)
-
-    def _close_trade(self, entry_price: float, exit_price: float, shares: float, side: str) -> tuple[float, float, float]:
-        per_share_cost = (self.config.commission_per_share + self.config.slippage_per_share) * 2  # entry + exit
-        if side == "LONG":
-            gross = (exit_price - entry_price) * shares
         else:
-            gross = (entry_price - exit_price) * shares
-        costs = per_share_cost * shares
-        net = gross - costs
-        return gross, costs, net
+            n_workers = min(cfg.n_jobs or os.cpu_count() or 1, len(sessions))
+            chunks = np.array_split(np.arange(len(sessions)), n_workers)
+            chunk_args = []
+            for chunk in chunks:
+                a, b = chunk[0], chunk[-1] + 1
+                lo, hi = act_bounds[a], act_bounds[b]
+                chunk_args.append(
+                    (*(arr[lo:hi] for arr in unit_args), act_bounds[a : b + 1] - lo, last_rows[a:b], close[last_rows[a:b]])
+                )
+            worker = partial(_unit_session_trades, per_share_cost=per_share_cost, entry_buffer_pct=cfg.entry_buffer_pct)
+            with ProcessPoolExecutor(max_workers=n_workers) as ex:
+                parts = ex.map(worker, *zip(*chunk_args))
+                session_records = [records for part in parts for records in part]
+
+        # Pass 2: compound capital through the sessions in order, scaling each day's trades.
+        offsets = np.zeros(len(session_records) + 1, dtype=np.int64)
+        np.cumsum([len(r) for r in session_records], out=offsets[1:])
+        records = np.concatenate(session_records) if session_records else np.empty(0, dtype=TRADE_RECORD)
+        vol_est = daily_vol.reindex(sessions).to_numpy(dtype=np.float64)
+        day_open = session_open[starts]
+        equity_start, daily_pnl, shares, keep = _compound_sessions(
+            records,
+            offsets,
+            day_open,
+            vol_est,
+            cfg.initial_capital,
+            cfg.target_daily_vol,
+            cfg.max_leverage,
+            per_share_cost,
+        )
+
+        trades_df = _trades_frame(records[keep], index)
+        equity_df = pd.DataFrame(
+            {
+                "equity_start": equity_start,
+                "daily_pnl": daily_pnl,
+                "equity_end": equity_start + daily_pnl,
+                "vol_est": vol_est,
+                "shares": shares,
+            },
+            index=sessions,
+        )
+        return BacktestResult(trades=trades_df, equity=equity_df)
@@ -1,9 +1,12 @@
 """Utilities for loading SPY intraday and daily datasets."""
 from __future__ import annotations
 
+import glob
+import os
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import Iterable, List, Optional
 
+import numpy as np
 import pandas as pd
 
 
@@ -32,15 +35,62 @@ def _validate_columns(df: pd.DataFrame, required: Iterable[str]) -> None:
         raise ValueError(f"Missing required columns: {missing}")
 
 
-def load_intraday(filepath: str | Path, tz: Optional[str] = "America/New_York") -> pd.DataFrame:
+def _cache_path(path: Path) -> Path:
+    st = path.stat()
+    return path.with_name(f"{path.name}.{st.st_mtime_ns}.{st.st_size}.parquet")
+
+
+def _read_csv_cached(filepath: str | Path, parse_dates: List[str], cache: bool = True) -> pd.DataFrame:
+    """
+    Read a CSV through a Parquet cache stored next to it.
+
+    The cache file name embeds the CSV's mtime and size, so editing or re-downloading
+    the CSV invalidates it; stale cache files for the same CSV are removed. The cache is
+    written to a temporary file and renamed into place, so an interrupted write never
+    leaves a truncated cache behind. Without pyarrow, if the directory isn't writable,
+    or if the cache can't be read or written for any other reason, this is a plain
+    `pd.read_csv`; an unreadable cache file is rebuilt.
+    """
+
+    path = Path(filepath)
+    if not cache:
+        return pd.read_csv(path, parse_dates=parse_dates)
+
+    cached = _cache_path(path)
+    if cached.exists():
+        try:
+            return pd.read_parquet(cached)
+        except ImportError:
+            return pd.read_csv(path, parse_dates=parse_dates)
+        except Exception:
+            pass  # corrupt or unreadable cache: rebuild it from the CSV below
+
+    df = pd.read_csv(path, parse_dates=parse_dates)
+    tmp = cached.with_name(f"{cached.name}.{os.getpid()}.tmp")
+    try:
+        for stale in path.parent.glob(f"{glob.escape(path.name)}.*.parquet"):
+            stale.unlink(missing_ok=True)
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, cached)
+    except Exception:
+        tmp.unlink(missing_ok=True)
+    return df
+
+
+def load_intraday(filepath: str | Path, tz: Optional[str] = "America/New_York", cache: bool = True) -> pd.DataFrame:
     """
     Load 1-minute OHLCV data and return a time-indexed DataFrame.
 
+    Files ending in ``.parquet`` are read as Parquet, anything else as CSV
+    (through a Parquet cache next to the CSV unless `cache` is False).
     The loader sorts by timestamp and optionally localizes/converts to the
     provided timezone so downstream modules can rely on consistent indexing.
     """
 
-    df = pd.read_csv(filepath, parse_dates=["timestamp"])
+    if Path(filepath).suffix == ".parquet":
+        df = pd.read_parquet(filepath)
+    else:
+        df = _read_csv_cached(filepath, parse_dates=["timestamp"], cache=cache)
     _validate_columns(df, REQUIRED_INTRADAY_COLUMNS)
 
     df = df.sort_values("timestamp").set_index("timestamp")
@@ -49,16 +99,72 @@ def load_intraday(filepath: str | Path, tz: Optional[str] = "America/New_York")
     return df
 
 
-def load_daily(filepath: str | Path) -> pd.DataFrame:
+def load_daily(filepath: str | Path, cache: bool = True) -> pd.DataFrame:
     """Load daily OHLCV data for volatility calculations."""
 
-    df = pd.read_csv(filepath, parse_dates=["date"])
+    df = _read_csv_cached(filepath, parse_dates=["date"], cache=cache)
     _validate_columns(df, REQUIRED_DAILY_COLUMNS)
 
     df = df.sort_values("date").set_index("date")
     return df
 
 
+def clip_date_range(df: pd.DataFrame, start: Optional[str] = None, end: Optional[str] = None) -> pd.DataFrame:
+    """
+    Clip a sorted, time-indexed frame to [start, end] (inclusive date strings).
+
+    Bounds are located by binary search and the frame is sliced positionally. Naive
+    bounds are localized to the index timezone so the same strings work for the
+    tz-aware intraday frame and the naive daily frame.
+    """
+
+    idx_tz = df.index.tz
+    if start:
+        s = pd.to_datetime(start)
+        if idx_tz and s.tzinfo is None:
+            s = s.tz_localize(idx_tz)
+        elif idx_tz and s.tzinfo is not None:
+            s = s.tz_convert(idx_tz)
+        df = df.iloc[df.index.searchsorted(s, side="left") :]
+    if end:
+        e = pd.to_datetime(end)
+        if idx_tz and e.tzinfo is None:
+            e = e.tz_localize(idx_tz)
+        elif idx_tz and e.tzinfo is not None:
+            e = e.tz_convert(idx_tz)
+        df = df.iloc[: df.index.searchsorted(e, side="right")]
+    return df
+
+
+NS_PER_DAY = 86_400_000_000_000
+
+
+def session_codes(index: pd.DatetimeIndex) -> np.ndarray:
+    """
+    Integer session key per row: days since the epoch of each bar's local calendar date.
+
+    Pure integer math on the wall-clock nanoseconds, so it is cheap to group or diff on
+    and ``pd.to_datetime(codes, unit="D")`` turns it back into session dates.
+    """
+
+    local = index.tz_localize(None) if index.tz is not None else index
+    return local.as_unit("ns").asi8 // NS_PER_DAY
+
+
+def session_starts(index: pd.DatetimeIndex) -> np.ndarray:
+    """
+    Return the row positions where a new session (local calendar date) begins.
+
+    Assumes a sorted index, so each session is one contiguous run of rows; the run
+    lengths are ``np.diff(starts, append=len(index))``.
+    """
+
+    codes = session_codes(index)
+    new_session = np.ones(len(codes), dtype=bool)
+    new_session[1:] = codes[1:] != codes[:-1]
+    return np.flatnonzero(new_session)
+
+
 def resample_to_minutes(df: pd.DataFrame, minutes: int) -> pd.DataFrame:
     """Downsample intraday bars to a custom minute interval while preserving volume-weighted prices."""
 
@@ -1,18 +1,26 @@
 """Volatility and noise-band helpers for intraday signals."""
 from __future__ import annotations
 
+from typing import Tuple
+
 import numpy as np
 import pandas as pd
+from numba import njit
+
+from .data_loader import session_codes
 
 
 def true_range(df: pd.DataFrame) -> pd.Series:
     """Compute True Range used by ATR."""
 
-    high_low = df["high"] - df["low"]
-    high_close = (df["high"] - df["close"].shift()).abs()
-    low_close = (df["low"] - df["close"].shift()).abs()
-    ranges = pd.concat([high_low, high_close, low_close], axis=1)
-    return ranges.max(axis=1)
+    high = df["high"].to_numpy(dtype=np.float64)
+    low = df["low"].to_numpy(dtype=np.float64)
+    prev_close = np.empty_like(high)
+    prev_close[:1] = np.nan
+    prev_close[1:] = df["close"].to_numpy(dtype=np.float64)[:-1]
+    # fmax skips NaN like DataFrame.max, so the first bar (no previous close) is high - low.
+    tr = np.fmax.reduce([high - low, np.abs(high - prev_close), np.abs(low - prev_close)])
+    return pd.Series(tr, index=df.index, copy=False)
 
 
 def average_true_range(df: pd.DataFrame, lookback: int = 14) -> pd.Series:
@@ -22,12 +30,88 @@ def average_true_range(df: pd.DataFrame, lookback: int = 14) -> pd.Series:
     return tr.rolling(window=lookback, min_periods=lookback).mean()
 
 
+def rolling_std(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Sample standard deviation over a trailing `window`; NaN until the window holds `window` non-NaN values.
+
+    Matches `Series.rolling(window, min_periods=window).std()`, including its ValueError for a
+    window below 1.
+    """
+
+    if window < 1:
+        raise ValueError(f"window must be at least 1, got {window}")
+    return _rolling_std_kernel(np.asarray(values, dtype=np.float64), int(window))
+
+
+@njit(cache=True)
+def _rolling_std_kernel(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    One pass of Welford's online variance that adds the newest value and removes the one leaving
+    the window, with the Kahan-compensated updates of pandas' rolling var.
+    """
+    n = len(values)
+    out = np.empty(n)
+    nobs = 0
+    mean = 0.0
+    ssqdm = 0.0
+    comp_add = 0.0
+    comp_remove = 0.0
+    same_run = 0
+    prev_value = values[0] if n else 0.0
+    for i in range(n):
+        if i >= window:
+            val = values[i - window]
+            if val == val:
+                nobs -= 1
+                if nobs:
+                    prev_mean = mean - comp_remove
+                    y = val - comp_remove
+                    t = y - mean
+                    comp_remove = t + mean - y
+                    mean = mean - t / nobs
+                    ssqdm = ssqdm - (val - prev_mean) * (val - mean)
+                else:
+                    mean = 0.0
+                    ssqdm = 0.0
+
+        val = values[i]
+        if val == val:
+            nobs += 1
+            # Runs of identical values give an exact 0 instead of rounding noise.
+            if val == prev_value:
+                same_run += 1
+            else:
+                same_run = 1
+            prev_value = val
+            prev_mean = mean - comp_add
+            y = val - comp_add
+            t = y - mean
+            comp_add = t + mean - y
+            mean = mean + t / nobs
+            ssqdm = ssqdm + (val - prev_mean) * (val - mean)
+
+        if nobs >= window and nobs > 1:
+            var = 0.0 if same_run >= nobs else ssqdm / (nobs - 1)
+            out[i] = np.sqrt(var) if var > 0 else 0.0
+        else:
+            out[i] = np.nan
+    return out
+
+
+def simple_returns(values: np.ndarray) -> np.ndarray:
+    """`pct_change` on a raw array: values[i] / values[i - 1] - 1, NaN for the first element."""
+
+    out = np.empty_like(values)
+    out[:1] = np.nan
+    out[1:] = values[1:] / values[:-1] - 1
+    return out
+
+
 def rolling_volatility(close: pd.Series, lookback: int = 20) -> pd.Series:
     """Rolling standard deviation of returns as a fast volatility proxy."""
 
-    returns = close.pct_change()
-    vol = returns.rolling(window=lookback, min_periods=lookback).std()
-    return vol * np.sqrt(252)  # annualized approximation
+    vol = rolling_std(simple_returns(close.to_numpy(dtype=np.float64)), lookback)
+    return pd.Series(vol * np.sqrt(252), index=close.index, name=close.name)  # annualized approximation
 
 
 def noise_band(df: pd.DataFrame, lookback: int = 20, multiple: float = 1.0) -> pd.DataFrame:
@@ -54,27 +138,29 @@ def compute_time_of_day_sigma(intraday: pd.DataFrame, lookback_days: int = 14) -
     previous `lookback_days` moves at the same HH:MM (uses only prior sessions).
     """
 
-    df = intraday.copy()
-    if not df.index.inferred_type.startswith("datetime"):
+    if not intraday.index.inferred_type.startswith("datetime"):
         raise ValueError("intraday index must be datetime-like")
 
-    df["session"] = pd.to_datetime(df.index.date)
-    df["time"] = df.index.strftime("%H:%M")
-    df["session_open"] = df.groupby("session")["open"].transform("first")
-    df["move"] = (df["close"] / df["session_open"] - 1.0).abs()
+    # Sessions and HH:MM slots are taken from local wall-clock time and encoded as
+    # integer row/column positions of a dense (n_sessions, n_slots) grid.
+    index = intraday.index
+    local = index.tz_localize(None) if index.tz is not None else index
+    sessions, session_pos = np.unique(session_codes(index), return_inverse=True)
+    slots, slot_pos = np.unique((local.hour * 60 + local.minute).to_numpy(), return_inverse=True)
+    cell = session_pos * len(slots) + slot_pos
+    if np.unique(cell).size != cell.size:
+        raise ValueError("intraday has more than one bar per session and HH:MM")
 
-    pivot = df.pivot(index="session", columns="time", values="move").sort_index()
-    sigma_pivot = pivot.rolling(window=lookback_days, min_periods=lookback_days).mean().shift(1)
-    sigma_long = sigma_pivot.stack().rename("sigma").reset_index()
+    first_open = _first_valid(intraday["open"].to_numpy(dtype=np.float64), session_pos, len(sessions))
+    move = np.abs(intraday["close"].to_numpy(dtype=np.float64) / first_open[session_pos] - 1.0)
 
-    reset_df = df.reset_index()
-    index_col = reset_df.columns[0]
-    merged = (
-        reset_df.merge(sigma_long, left_on=["session", "time"], right_on=["session", "time"], how="left")
-        .set_index(index_col)
+    # Missing bars stay NaN in the grid, so their windows fall short of min_periods as before.
+    grid = np.full((len(sessions), len(slots)), np.nan)
+    grid[session_pos, slot_pos] = move
+    sigma_grid = (
+        pd.DataFrame(grid).rolling(window=lookback_days, min_periods=lookback_days).mean().shift(1).to_numpy()
     )
-    merged.index.name = intraday.index.name or index_col
-    return merged["sigma"]
+    return pd.Series(sigma_grid[session_pos, slot_pos], index=index, name="sigma")
 
 
 def compute_noise_bands(
@@ -88,19 +174,101 @@ def compute_noise_bands(
     Upper = max(open_t, prev_close) * (1 + VM * sigma_t)
     Lower = min(open_t, prev_close) * (1 - VM * sigma_t)
     where sigma_t is the average absolute move from open to HH:MM over the previous `lookback_days` sessions.
+    Unsorted bars are handled in time order and returned in their input order.
     """
 
-    df = intraday.copy()
-    sigma = compute_time_of_day_sigma(df, lookback_days=lookback_days)
-    df["session"] = pd.to_datetime(df.index.date)
-    df["session_open"] = df.groupby("session")["open"].transform("first")
+    if not intraday.index.is_monotonic_increasing:
+        order = np.argsort(intraday.index, kind="stable")
+        bands = compute_noise_bands(intraday.iloc[order], lookback_days, volatility_multiplier)
+        return bands.iloc[np.argsort(order)]
+
+    sigma = compute_time_of_day_sigma(intraday, lookback_days=lookback_days)
+    pos, n_sessions = _session_positions(session_codes(intraday.index))
+    bands = gap_adjusted_bands(
+        _first_valid(intraday["open"].to_numpy(dtype=np.float64), pos, n_sessions)[pos],
+        _previous_last_valid(intraday["close"].to_numpy(dtype=np.float64), pos, n_sessions)[pos],
+        sigma.to_numpy(),
+        volatility_multiplier,
+    )
+    bands.index = intraday.index
+    bands.insert(0, "sigma", sigma)
+    return bands
 
-    session_close = df.groupby("session")["close"].last()
-    prev_close_map = session_close.shift()
-    df["prev_close"] = df["session"].map(prev_close_map)
 
-    sigma_scaled = sigma * volatility_multiplier
-    upper = np.maximum(df["session_open"], df["prev_close"]) * (1 + sigma_scaled)
-    lower = np.minimum(df["session_open"], df["prev_close"]) * (1 - sigma_scaled)
+def _session_positions(key: np.ndarray) -> Tuple[np.ndarray, int]:
+    """
+    Dense session position (0 for the earliest session) of every bar, and the number of sessions.
+
+    Rows may be in any order; already sorted keys take an O(n) path instead of a sort.
+    """
+
+    if len(key) == 0 or (key[1:] >= key[:-1]).all():
+        new_session = np.ones(len(key), dtype=bool)
+        new_session[1:] = key[1:] != key[:-1]
+        return np.cumsum(new_session) - 1, int(new_session.sum())
+    sessions, pos = np.unique(key, return_inverse=True)
+    return pos, len(sessions)
 
-    return pd.DataFrame({"sigma": sigma, "upper": upper, "lower": lower}, index=intraday.index)
+
+def _first_valid(values: np.ndarray, pos: np.ndarray, n_sessions: int) -> np.ndarray:
+    """Each session's first non-NaN value in row order (NaN if none), like groupby().first()."""
+
+    n = len(values)
+    valid = ~np.isnan(values)
+    first = np.full(n_sessions, n)
+    np.minimum.at(first, pos[valid], np.flatnonzero(valid))
+    return np.append(values, np.nan)[first]
+
+
+def _previous_last_valid(values: np.ndarray, pos: np.ndarray, n_sessions: int) -> np.ndarray:
+    """Each session's previous session's last non-NaN value (NaN for the first), like groupby().last().shift()."""
+
+    n = len(values)
+    valid = ~np.isnan(values)
+    last = np.full(n_sessions, -1)
+    np.maximum.at(last, pos[valid], np.flatnonzero(valid))
+    last[last < 0] = n  # no valid value: index the NaN pad
+    prev = np.empty(n_sessions)
+    prev[:1] = np.nan
+    prev[1:] = np.append(values, np.nan)[last[:-1]]
+    return prev
+
+
+def session_first_open(session_key: np.ndarray, open_: np.ndarray) -> np.ndarray:
+    """Broadcast each session's first non-NaN open to every bar of the session (rows in any order)."""
+
+    pos, n_sessions = _session_positions(session_key)
+    return _first_valid(open_, pos, n_sessions)[pos]
+
+
+def previous_session_close(df: pd.DataFrame, session_label: str = "session") -> pd.Series:
+    """
+    Broadcast each session's prior-session close to every bar of the session (NaN for the first session).
+
+    A session's close is its last non-NaN close; rows may be in any order.
+    """
+
+    pos, n_sessions = _session_positions(df[session_label].to_numpy())
+    prev_close = _previous_last_valid(df["close"].to_numpy(dtype=np.float64), pos, n_sessions)
+    return pd.Series(prev_close[pos], index=df.index, name="prev_close")
+
+
+def gap_adjusted_bands(
+    session_open: np.ndarray,
+    prev_close: np.ndarray,
+    sigma: np.ndarray,
+    volatility_multiplier: float = 1.0,
+) -> pd.DataFrame:
+    """
+    Apply the volatility multiplier to precomputed band inputs.
+
+    Split out from `compute_noise_bands` so parameter sweeps can compute sigma and the
+    open/prev-close anchors once and only redo this cheap step per multiplier. Takes
+    aligned float arrays and returns `upper`/`lower` columns on a RangeIndex; callers
+    attach their own index.
+    """
+
+    sigma_scaled = sigma * volatility_multiplier
+    upper = np.maximum(session_open, prev_close) * (1 + sigma_scaled)
+    lower = np.minimum(session_open, prev_close) * (1 - sigma_scaled)
+    return pd.DataFrame({"upper": upper, "lower": lower})
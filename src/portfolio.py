@@ -3,6 +3,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+import numpy as np
 import pandas as pd
 
 
@@ -23,16 +24,33 @@ class Portfolio:
         Positions are interpreted as fractional exposures of capital (e.g., 1.0 = 100% long).
         """
 
-        returns = prices["close"].pct_change().fillna(0.0)
-        pos = positions.fillna(0.0)
+        index = prices.index
+        if not positions.index.equals(index):
+            positions = positions.reindex(index)
+        close = prices["close"].to_numpy(dtype=np.float64)
+        pos = positions.to_numpy(dtype=np.float64)
+        pos = np.where(np.isnan(pos), 0.0, pos)
 
-        turnover = pos.diff().abs().fillna(pos.abs())
+        returns = np.zeros_like(close)
+        if len(close):
+            with np.errstate(divide="ignore", invalid="ignore"):
+                np.divide(close[1:], close[:-1], out=returns[1:])
+            returns[1:] -= 1
+            returns[np.isnan(returns)] = 0.0
+
+        # The first bar's turnover is opening its position from flat.
+        turnover = np.empty_like(pos)
+        turnover[:1] = np.abs(pos[:1])
+        np.subtract(pos[1:], pos[:-1], out=turnover[1:])
+        np.abs(turnover, out=turnover)
         trading_cost = turnover * (self.config.transaction_cost_bps / 10_000)
 
-        strategy_return = pos.shift().fillna(0.0) * returns
+        prev_pos = np.zeros_like(pos)
+        prev_pos[1:] = pos[:-1]
+        strategy_return = prev_pos * returns
         net_return = strategy_return - trading_cost
 
-        equity = (1 + net_return).cumprod() * self.config.initial_capital
+        equity = np.cumprod(1 + net_return) * self.config.initial_capital
 
         results = pd.DataFrame(
             {
@@ -43,6 +61,8 @@ class Portfolio:
                 "strategy_return": strategy_return,
                 "net_return": net_return,
                 "equity": equity,
-            }
+            },
+            index=index,
+            copy=False,
         )
         return results
@@ -1,8 +1,11 @@
 """Volume-weighted average price helpers."""
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 
+from .data_loader import session_codes, session_starts
+
 
 def intraday_vwap(df: pd.DataFrame, session_label: str = "session") -> pd.DataFrame:
     """
@@ -14,16 +17,37 @@ def intraday_vwap(df: pd.DataFrame, session_label: str = "session") -> pd.DataFr
     if not df.index.inferred_type.startswith("datetime"):
         raise ValueError("Index must be datetime-like for VWAP computation")
 
-    tmp = df.copy()
-    tmp[session_label] = tmp.index.date
-    tmp["pv"] = tmp["close"] * tmp["volume"]
+    codes = session_codes(df.index)
+    starts = session_starts(df.index)
+    vwap = running_vwap(df["close"].to_numpy(dtype=np.float64), df["volume"].to_numpy(dtype=np.float64), starts)
+    return df.assign(**{session_label: pd.to_datetime(codes, unit="D"), "vwap": vwap})
+
+
+def running_vwap(close: np.ndarray, volume: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """
+    Running VWAP that restarts at each position in `starts` (see `session_starts`).
+
+    Each session is laid out as a row of a zero-padded (n_sessions, max_bars) grid, so
+    the per-session running sums are one cumsum along axis 1: no groupby, and no
+    subtracting offsets from a history-long running total. As with groupby cumsum, a
+    NaN price*volume or volume is skipped by the running sums and only that bar's VWAP
+    is NaN.
+    """
 
-    grouped = tmp.groupby(session_label)
-    tmp["cum_pv"] = grouped["pv"].cumsum()
-    tmp["cum_vol"] = grouped["volume"].cumsum()
-    tmp["vwap"] = tmp["cum_pv"] / tmp["cum_vol"]
+    n = len(close)
+    session_id = np.repeat(np.arange(len(starts)), np.diff(starts, append=n))
+    bar_pos = np.arange(n) - starts[session_id]
+    width = int(bar_pos.max()) + 1 if n else 0
 
-    return tmp.drop(columns=["pv", "cum_pv", "cum_vol"])
+    pv = close * volume
+    missing = np.isnan(pv) | np.isnan(volume)
+    grid = np.zeros((2, len(starts), width))
+    grid[0, session_id, bar_pos] = np.where(np.isnan(pv), 0.0, pv)
+    grid[1, session_id, bar_pos] = np.where(np.isnan(volume), 0.0, volume)
+    cum_pv, cum_vol = np.cumsum(grid, axis=2)[:, session_id, bar_pos]
+    vwap = cum_pv / cum_vol
+    vwap[missing] = np.nan
+    return vwap
 
 
 def session_summary(df: pd.DataFrame, session_label: str = "session") -> pd.DataFrame:
@@ -0,0 +1,132 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics import (
+    alpha_beta,
+    annualized_return,
+    annualized_volatility,
+    daily_returns_from_equity,
+    hit_ratio,
+    max_drawdown,
+    sharpe_ratio,
+    summarize_equity,
+)
+
+
+def test_return_metrics_skip_nan_like_pandas():
+    """NaN returns are skipped like Series.prod/std/mean, but still count towards the years."""
+
+    r = pd.Series([0.01, np.nan, -0.02, 0.03, 0.005])
+    clean = r.dropna()
+
+    assert annualized_return(r) == pytest.approx((1 + clean).prod() ** (252 / len(r)) - 1)
+    assert annualized_volatility(r) == pytest.approx(clean.std() * math.sqrt(252))
+    vol = clean.std() * math.sqrt(252)
+    assert sharpe_ratio(r) == pytest.approx(clean.mean() / vol)
+    assert sharpe_ratio(r, rf_rate=0.02) == pytest.approx((clean - 0.02 / 252).mean() / vol)
+
+    assert annualized_return(pd.Series([np.nan, np.nan])) == 0.0
+    assert math.isnan(annualized_volatility(pd.Series([np.nan, 0.1])))
+    assert math.isnan(sharpe_ratio(pd.Series([np.nan, 0.1])))
+    assert annualized_return(pd.Series([-1.0, 0.1])) == -1.0
+
+
+@pytest.mark.parametrize(
+    "returns",
+    [
+        [0.01, -1.5, 0.01, 0.02],  # one period below -100%: negative growth, integer exponent
+        [0.01, -1.5, 0.01, 0.02, 0.03],  # negative growth, fractional exponent
+        [-1.5, -1.5, 0.1],  # two losses below -100% multiply back to positive growth
+        [np.nan, -1.5, 0.2, 0.1],
+    ],
+)
+def test_annualized_return_matches_pandas_for_growth_at_or_below_zero(returns):
+    r = pd.Series(returns)
+    with np.errstate(invalid="ignore"):
+        expected = (1 + r).prod() ** (1 / (len(r) / 252)) - 1
+    assert annualized_return(r) == pytest.approx(expected, nan_ok=True)
+
+
+@pytest.mark.parametrize(
+    "equity",
+    [
+        [100.0, 120.0, 90.0, 130.0, 110.0],
+        [np.nan, 1.0, 2.0, 1.0],
+        [0.0, 1.0, 0.5],
+        [2.0, np.nan, 1.0, 3.0],
+        [0.0, 0.0, 0.0],
+        [np.nan, np.nan],
+        [],
+    ],
+)
+def test_max_drawdown_matches_cummax(equity):
+    e = pd.Series(equity, dtype=float)
+    expected = (e / e.cummax() - 1).min()
+    assert max_drawdown(e) == pytest.approx(expected, nan_ok=True)
+
+
+def _equity(end, start=None):
+    end = np.asarray(end, dtype=float)
+    if start is None:
+        start = np.r_[end[:1], end[:-1]]
+    index = pd.bdate_range("2024-01-02", periods=len(end), name="date")
+    return pd.DataFrame({"equity_start": start, "equity_end": end}, index=index)
+
+
+def _random_equity(n=60, seed=0):
+    rng = np.random.default_rng(seed)
+    end = 100_000 * np.cumprod(1 + rng.normal(0.0005, 0.01, n))
+    return _equity(end, np.r_[100_000, end[:-1]])
+
+
+def _bench(equity, seed=1, nan_at=()):
+    rng = np.random.default_rng(seed)
+    bench = pd.Series(rng.normal(0.0003, 0.008, len(equity)), index=equity.index)
+    bench.iloc[list(nan_at)] = np.nan
+    return bench
+
+
+_CASES = {
+    "random": lambda: (_random_equity(), None),
+    "random_bench": lambda: (_random_equity(), _bench(_random_equity())),
+    "nan_bench": lambda: (_random_equity(), _bench(_random_equity(), nan_at=(0, 5, 17))),
+    "shifted_bench": lambda: (_random_equity(), _bench(_random_equity()).iloc[10:]),
+    "single_bench_pair": lambda: (_random_equity(), _bench(_random_equity()).iloc[:1]),
+    "empty": lambda: (_equity([]), pd.Series([], dtype=float)),
+    "single_row": lambda: (_equity([101.0], [100.0]), _bench(_equity([101.0]))),
+    "below_minus_100pct": lambda: (_equity([100.0, 101.0, -50.0, -50.5], [100.0, 100.0, 101.0, -50.0]), None),
+    "zero_equity": lambda: (_equity([100.0, 50.0, 0.0, 0.0, 0.0], [100.0, 100.0, 50.0, 0.0, 0.0]), None),
+}
+
+
+@pytest.mark.parametrize("case", sorted(_CASES))
+def test_summarize_equity_matches_standalone_metrics(case):
+    equity, bench = _CASES[case]()
+    returns = daily_returns_from_equity(equity)
+    curve = equity["equity_end"]
+
+    alpha, beta = alpha_beta(returns, bench, rf_rate=0.01) if bench is not None else (0.0, 0.0)
+    expected = [
+        annualized_return(returns),
+        sharpe_ratio(returns, rf_rate=0.01),
+        max_drawdown(curve),
+        curve.iloc[-1] / curve.iloc[0] - 1 if len(curve) > 1 else 0.0,
+        alpha,
+        beta,
+        hit_ratio(returns),
+    ]
+
+    summary = summarize_equity(equity, bench, rf_rate=0.01)
+    actual = [
+        summary.cagr,
+        summary.sharpe,
+        summary.max_drawdown,
+        summary.total_return,
+        summary.alpha,
+        summary.beta,
+        summary.hit_ratio,
+    ]
+    assert actual == pytest.approx(expected, rel=1e-9, nan_ok=True)
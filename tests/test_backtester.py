@@ -0,0 +1,128 @@
+import datetime as dt
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backtester import Backtester, BacktesterConfig
+
+
+def _make_bars(n_sessions: int, seed: int = 0):
+    """Random-walk 1-minute RTH bars plus matching daily bars."""
+
+    rng = np.random.default_rng(seed)
+    days = pd.bdate_range("2024-01-02", periods=n_sessions)
+    minutes = pd.timedelta_range(start="9h30min", end="16h", freq="min")
+    index = pd.DatetimeIndex([d + m for d in days for m in minutes]).tz_localize("America/New_York")
+
+    close = 100 + np.cumsum(rng.normal(0, 0.05, len(index)))
+    intraday = pd.DataFrame(
+        {
+            "open": close + rng.normal(0, 0.01, len(index)),
+            "high": close + 0.05,
+            "low": close - 0.05,
+            "close": close,
+            "volume": rng.integers(1_000, 10_000, len(index)).astype(float),
+        },
+        index=index,
+    )
+    daily_close = 100 + np.cumsum(rng.normal(0, 1.0, n_sessions + 30))
+    daily = pd.DataFrame(
+        {"open": daily_close, "high": daily_close, "low": daily_close, "close": daily_close, "volume": 1e6},
+        index=pd.bdate_range(end=days[-1], periods=n_sessions + 30, name="date"),
+    )
+    return intraday, daily
+
+
+@pytest.mark.parametrize("n_sessions, n_jobs", [(12, 2), (12, 3), (3, 4)])
+def test_parallel_session_pass_matches_serial(n_sessions, n_jobs):
+    """Splitting the per-session pass across processes (even more than sessions) must not change results."""
+
+    intraday, daily = _make_bars(n_sessions)
+    common = dict(lookback_days=2, volatility_multiplier=0.5, earliest_entry_time=dt.time(9, 30))
+
+    serial = Backtester(BacktesterConfig(n_jobs=1, **common)).run(intraday, daily)
+    parallel = Backtester(BacktesterConfig(n_jobs=n_jobs, **common)).run(intraday, daily)
+
+    assert len(serial.equity) == n_sessions
+    assert len(serial.trades) > 0
+    pd.testing.assert_frame_equal(serial.trades, parallel.trades)
+    pd.testing.assert_frame_equal(serial.equity, parallel.equity)
+
+
+def _hand_built_bars():
+    """
+    Three sessions of bars at 09:30, the half-hour decision times 10:00-12:00 and 15:59.
+
+    Sessions 1-2 are the sigma warm-up (lookback_days=2): every bar closes 1% above the
+    100 open, so session 3 has sigma = 1% at every slot, prev_close = 101 and open = 100,
+    i.e. upper = 101 * 1.01 = 102.01 and lower = 100 * 0.99 = 99.
+    """
+
+    days = pd.bdate_range("2024-01-02", periods=3)
+    times = ["09:30", "10:00", "10:30", "11:00", "11:30", "12:00", "15:59"]
+    session3 = [100.0, 103.0, 103.0, 102.1, 98.5, 103.0, 104.0]
+    rows = []
+    for d, day in enumerate(days):
+        for t, time in enumerate(times):
+            close = session3[t] if d == 2 else 101.0
+            # A heavy opening bar pins session 3's VWAP near 100, below the bands.
+            volume = 100_000.0 if t == 0 else 100.0
+            rows.append((day + pd.Timedelta(time + ":00"), 100.0, close, volume))
+    ts, open_, close, volume = zip(*rows)
+    index = pd.DatetimeIndex(ts).tz_localize("America/New_York")
+    intraday = pd.DataFrame(
+        {"open": open_, "high": np.maximum(open_, close), "low": np.minimum(open_, close), "close": close, "volume": volume},
+        index=index,
+    )
+
+    rng = np.random.default_rng(7)
+    daily_close = 100 * np.cumprod(1 + rng.normal(0, 0.01, 40))
+    daily = pd.DataFrame(
+        {"open": daily_close, "high": daily_close, "low": daily_close, "close": daily_close, "volume": 1e6},
+        index=pd.bdate_range(end=days[-1], periods=40, name="date"),
+    )
+    return intraday, daily
+
+
+def test_hand_built_session_trades():
+    """
+    Session 3, with entries allowed from 10:30 and the default 0.1% entry buffer:
+
+    - 10:00 closes above the band but is before earliest_entry_time: no trade.
+    - 10:30 enters long at 103.
+    - 11:00 closes at 102.1, above the stop (max(vwap, upper) = 102.01) but inside the
+      entry buffer: band exit.
+    - 11:30 closes below lower * 0.999: short at 98.5.
+    - 12:00 closes at 103: the short is stopped (stop = min(vwap, lower) = 99) and the bar,
+      now above the upper band, reverses into a long. The stop always sits at or beyond the
+      opposite band, so a reversal shows up as a stop plus a same-bar entry.
+    - The long is closed at the session's last bar (15:59, 104) as an end-of-day exit.
+    """
+
+    intraday, daily = _hand_built_bars()
+    cfg = BacktesterConfig(lookback_days=2, volatility_multiplier=1.0, earliest_entry_time=dt.time(10, 30))
+    result = Backtester(cfg).run(intraday, daily)
+    trades = result.trades
+
+    def ts(time):
+        return pd.Timestamp(f"2024-01-04 {time}", tz="America/New_York")
+
+    assert list(trades["entry_time"]) == [ts("10:30"), ts("11:30"), ts("12:00")]
+    assert list(trades["exit_time"]) == [ts("11:00"), ts("12:00"), ts("15:59")]
+    assert list(trades["side"]) == ["LONG", "SHORT", "LONG"]
+    assert list(trades["exit_reason"]) == ["band_exit", "stop", "eod"]
+    assert list(trades["entry_price"]) == [103.0, 98.5, 103.0]
+    assert list(trades["exit_price"]) == [102.1, 103.0, 104.0]
+
+    # Warm-up sessions have no bands and don't trade; session 3 is sized from the prior-day
+    # daily vol estimate against its 100 open.
+    equity = result.equity
+    assert list(equity["daily_pnl"].iloc[:2]) == [0.0, 0.0]
+    vol = daily["close"].pct_change().rolling(14, min_periods=14).std().shift(1).loc["2024-01-04"]
+    shares = cfg.initial_capital * min(cfg.target_daily_vol / vol, cfg.max_leverage) / 100.0
+    per_share_cost = (cfg.commission_per_share + cfg.slippage_per_share) * 2
+    assert trades["shares"].to_numpy() == pytest.approx([shares] * 3)
+    gross = np.array([102.1 - 103.0, 98.5 - 103.0, 104.0 - 103.0]) * shares
+    assert trades["net_pnl"].to_numpy() == pytest.approx(gross - per_share_cost * shares)
+    assert equity["equity_end"].iloc[-1] == pytest.approx(cfg.initial_capital + trades["net_pnl"].sum())
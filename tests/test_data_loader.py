@@ -0,0 +1,77 @@
+import os
+
+import pandas as pd
+import pytest
+
+from src.data_loader import _read_csv_cached
+
+pytest.importorskip("pyarrow")
+
+
+def _write_daily_csv(path, closes, mtime_ns):
+    frame = pd.DataFrame(
+        {
+            "date": pd.bdate_range("2024-01-02", periods=len(closes)),
+            "open": 100.0,
+            "high": 101.0,
+            "low": 99.0,
+            "close": closes,
+            "volume": 1000,
+        }
+    )
+    frame.to_csv(path, index=False)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+    return pd.read_csv(path, parse_dates=["date"])
+
+
+def _cache_files(tmp_path):
+    return sorted(p.name for p in tmp_path.glob("*.parquet"))
+
+
+def test_cache_is_written_then_read_back(tmp_path):
+    csv = tmp_path / "daily.csv"
+    expected = _write_daily_csv(csv, [100.0, 101.0, 102.0], 1_700_000_000_000_000_000)
+
+    pd.testing.assert_frame_equal(_read_csv_cached(csv, parse_dates=["date"]), expected)
+    (cached,) = tmp_path.glob("*.parquet")
+    assert cached.name == f"daily.csv.1700000000000000000.{csv.stat().st_size}.parquet"
+
+    # A hit is served from the cache file, not the CSV.
+    marked = expected.assign(close=-1.0)
+    marked.to_parquet(cached, index=False)
+    pd.testing.assert_frame_equal(_read_csv_cached(csv, parse_dates=["date"]), marked)
+
+
+def test_changed_csv_rebuilds_cache_and_removes_stale_file(tmp_path):
+    csv = tmp_path / "daily.csv"
+    _write_daily_csv(csv, [100.0, 101.0, 102.0], 1_700_000_000_000_000_000)
+    _read_csv_cached(csv, parse_dates=["date"])
+    (stale,) = _cache_files(tmp_path)
+
+    expected = _write_daily_csv(csv, [100.0, 101.0, 102.0, 103.0], 1_700_000_001_000_000_000)
+    pd.testing.assert_frame_equal(_read_csv_cached(csv, parse_dates=["date"]), expected)
+
+    (fresh,) = _cache_files(tmp_path)
+    assert fresh != stale
+    assert fresh.startswith("daily.csv.1700000001000000000.")
+    pd.testing.assert_frame_equal(pd.read_parquet(tmp_path / fresh), expected)
+
+
+def test_corrupt_cache_is_rebuilt_from_csv(tmp_path):
+    csv = tmp_path / "daily.csv"
+    expected = _write_daily_csv(csv, [100.0, 101.0, 102.0], 1_700_000_000_000_000_000)
+    _read_csv_cached(csv, parse_dates=["date"])
+    (cached,) = tmp_path.glob("*.parquet")
+    cached.write_bytes(b"not a parquet file")
+
+    pd.testing.assert_frame_equal(_read_csv_cached(csv, parse_dates=["date"]), expected)
+    pd.testing.assert_frame_equal(pd.read_parquet(cached), expected)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["daily.csv", cached.name]
+
+
+def test_cache_disabled_reads_csv_without_writing_a_cache(tmp_path):
+    csv = tmp_path / "daily.csv"
+    expected = _write_daily_csv(csv, [100.0, 101.0, 102.0], 1_700_000_000_000_000_000)
+
+    pd.testing.assert_frame_equal(_read_csv_cached(csv, parse_dates=["date"], cache=False), expected)
+    assert _cache_files(tmp_path) == []
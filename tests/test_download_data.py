@@ -0,0 +1,143 @@
+import asyncio
+import datetime as dt
+import functools
+
+import httpx
+import orjson
+import pandas as pd
+import pytest
+
+from scripts import download_data
+from scripts.download_data import PolygonClient
+
+
+def _bar(t_ms, close):
+    return {"t": t_ms, "o": close, "h": close, "l": close, "c": close, "v": 100.0}
+
+
+def test_fetch_aggs_follows_next_url_cursor():
+    """Polygon's next_url carries a cursor but no apiKey; the key must be added without dropping the cursor."""
+
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.url)
+        if len(seen) > 2:
+            pytest.fail(f"unexpected extra request: {request.url}")
+        if "cursor" not in request.url.params:
+            body = {"results": [_bar(1, 100.0)], "next_url": "https://api.test/v2/aggs/ticker/SPY/range/1/minute/a/b?cursor=abc"}
+        else:
+            body = {"results": [_bar(2, 101.0)]}
+        return httpx.Response(200, content=orjson.dumps(body))
+
+    async def fetch():
+        client = PolygonClient("k", throttle_seconds=0, base_url="https://api.test", transport=httpx.MockTransport(handler))
+        async with client:
+            return await client.fetch_aggs("SPY", 1, "minute", "2024-01-01", "2024-01-31")
+
+    results = asyncio.run(fetch())
+
+    assert [r["c"] for r in results] == [100.0, 101.0]
+    assert seen[0].params["apiKey"] == "k"
+    assert seen[1].params["cursor"] == "abc"
+    assert seen[1].params["apiKey"] == "k"
+
+
+def _polygon_handler(started, head_release=None):
+    """Serve one bar per request at the chunk's start date; optionally hold January until `head_release` is set."""
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        _, _, _, _, _, _, multiplier, timespan, start, end = request.url.path.split("/")
+        if timespan == "minute":
+            started.append(start)
+            if head_release is not None and start.endswith("-01-01"):
+                await head_release.wait()
+        t_ms = int(dt.datetime.fromisoformat(start + "T14:30:00+00:00").timestamp() * 1000)
+        return httpx.Response(200, content=orjson.dumps({"results": [_bar(t_ms, 100.0)]}))
+
+    return handler
+
+
+def test_download_fetches_a_bounded_window_ahead_of_the_writer(tmp_path, monkeypatch, capsys):
+    """While January is stalled, only max_concurrency + 1 month chunks may be started."""
+
+    started = []
+    started_while_stalled = []
+
+    async def run():
+        head_release = asyncio.Event()
+        transport = httpx.MockTransport(_polygon_handler(started, head_release))
+        monkeypatch.setattr(download_data, "PolygonClient", functools.partial(PolygonClient, transport=transport))
+
+        async def release_head():
+            await asyncio.sleep(0.2)
+            started_while_stalled.extend(started)
+            head_release.set()
+
+        releaser = asyncio.create_task(release_head())
+        await download_data._download(args, "k", dt.date(2024, 1, 1), dt.date(2024, 12, 31))
+        await releaser
+
+    args = download_data.parse_args(
+        [
+            "--start-date", "2024-01-01",
+            "--end-date", "2024-12-31",
+            "--intraday-path", str(tmp_path / "spy_1min.csv"),
+            "--daily-path", str(tmp_path / "spy_daily.csv"),
+            "--throttle-seconds", "0",
+            "--max-concurrency", "2",
+        ]
+    )
+    asyncio.run(run())
+
+    assert started_while_stalled == ["2024-01-01", "2024-02-01", "2024-03-01"]
+    assert len(started) == 12
+    out = capsys.readouterr().out
+    assert out.count("Fetching intraday") == 12
+
+    intraday = pd.read_csv(tmp_path / "spy_1min.csv")
+    assert list(intraday["timestamp"].str[:7]) == [f"2024-{m:02d}" for m in range(1, 13)]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["spy_1min.csv", "spy_daily.csv"]
+
+
+def _run_main(tmp_path, monkeypatch, intraday_name, fmt):
+    transport = httpx.MockTransport(_polygon_handler([]))
+    monkeypatch.setattr(download_data, "PolygonClient", functools.partial(PolygonClient, transport=transport))
+    return download_data.main(
+        [
+            "--start-date", "2024-01-01",
+            "--end-date", "2024-02-29",
+            "--intraday-path", str(tmp_path / intraday_name),
+            "--daily-path", str(tmp_path / "daily.csv"),
+            "--format", fmt,
+            "--api-key", "k",
+            "--throttle-seconds", "0",
+        ]
+    )
+
+
+@pytest.mark.parametrize(
+    "intraday_name, fmt, written",
+    [
+        ("bars.parquet", "csv", {"bars.parquet": "csv"}),
+        ("bars.csv", "parquet", {"bars.parquet": "parquet"}),
+        ("bars.csv", "both", {"bars.csv": "csv", "bars.parquet": "parquet"}),
+    ],
+)
+def test_download_writes_the_requested_formats(tmp_path, monkeypatch, intraday_name, fmt, written):
+    """The writer follows --format, not the suffix of --intraday-path."""
+
+    pytest.importorskip("pyarrow")
+    assert _run_main(tmp_path, monkeypatch, intraday_name, fmt) == 0
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted([*written, "daily.csv"])
+    for name, kind in written.items():
+        path = tmp_path / name
+        frame = pd.read_parquet(path) if kind == "parquet" else pd.read_csv(path)
+        assert len(frame) == 2
+
+
+def test_download_rejects_both_formats_on_a_parquet_path(tmp_path, monkeypatch, capsys):
+    assert _run_main(tmp_path, monkeypatch, "bars.parquet", "both") == 1
+    assert "--format both" in capsys.readouterr().err
+    assert list(tmp_path.iterdir()) == []
@@ -1,7 +1,8 @@
+import numpy as np
 import pandas as pd
 import pytest
 
-from src.noise_area import compute_noise_bands
+from src.noise_area import compute_noise_bands, compute_time_of_day_sigma, rolling_std
 
 
 def test_noise_band_gap_adjustment_and_sigma():
@@ -39,3 +40,72 @@ def test_noise_band_gap_adjustment_and_sigma():
 
     assert pytest.approx(expected_upper, rel=1e-6) == row["upper"]
     assert pytest.approx(expected_lower, rel=1e-6) == row["lower"]
+
+
+def test_time_of_day_sigma_missing_bar_shortens_window():
+    """
+    A bar missing from one prior session leaves that HH:MM slot without a full
+    lookback window, while other slots are unaffected.
+    """
+
+    rows = []
+    for i in range(4):
+        date = pd.Timestamp("2024-01-{:02d}".format(i + 1))
+        open_px = 100.0
+        rows.append({"ts": date + pd.Timedelta(hours=9, minutes=30), "open": open_px, "close": open_px * 1.002})
+        if i != 1:  # session 2 has no 10:00 bar
+            rows.append({"ts": date + pd.Timedelta(hours=10), "open": open_px, "close": open_px * 1.01})
+
+    df = pd.DataFrame(rows).set_index("ts")
+    df.index = df.index.tz_localize("America/New_York")
+
+    sigma = compute_time_of_day_sigma(df, lookback_days=2)
+
+    day3 = pd.Timestamp("2024-01-03 09:30", tz="America/New_York")
+    assert pytest.approx(0.002, rel=1e-6) == sigma.loc[day3]
+    # Window for day 3 at 10:00 is sessions 1-2, and session 2 lacks the bar.
+    assert pd.isna(sigma.loc[pd.Timestamp("2024-01-03 10:00", tz="America/New_York")])
+    # Day 4 uses sessions 2-3 at 09:30 (full) and still lacks session 2 at 10:00.
+    assert pytest.approx(0.002, rel=1e-6) == sigma.loc[pd.Timestamp("2024-01-04 09:30", tz="America/New_York")]
+    assert pd.isna(sigma.loc[pd.Timestamp("2024-01-04 10:00", tz="America/New_York")])
+
+
+def test_noise_bands_do_not_depend_on_row_order():
+    """Sessions are grouped by date, so a shuffled frame gives the same bands row for row."""
+
+    rng = np.random.default_rng(0)
+    days = pd.bdate_range("2024-01-02", periods=6)
+    minutes = pd.timedelta_range(start="9h30min", end="10h30min", freq="min")
+    index = pd.DatetimeIndex([d + m for d in days for m in minutes]).tz_localize("America/New_York")
+    close = 100 + np.cumsum(rng.normal(0, 0.05, len(index)))
+    df = pd.DataFrame({"open": close + rng.normal(0, 0.01, len(index)), "close": close}, index=index)
+    df.iloc[[0, len(minutes)], 0] = np.nan  # first opens missing: fall back to the next valid open
+    df.iloc[2 * len(minutes) - 1, 1] = np.nan  # last close missing: fall back to the previous valid close
+
+    expected = compute_noise_bands(df, lookback_days=2, volatility_multiplier=0.5)
+    shuffled = df.iloc[rng.permutation(len(df))]
+    result = compute_noise_bands(shuffled, lookback_days=2, volatility_multiplier=0.5)
+
+    pd.testing.assert_frame_equal(result, expected.loc[shuffled.index])
+    assert expected["upper"].notna().sum() > 0
+
+
+@pytest.mark.parametrize("window", [1, 2, 3, 5, 20])
+def test_rolling_std_matches_pandas(window):
+    rng = np.random.default_rng(window)
+    values = rng.normal(0, 0.01, 200)
+    values[[3, 4, 50, 51, 52, 120]] = np.nan
+    values[60:80] = 0.004  # constant run: exactly zero once the window is inside it
+    values[150:155] = np.nan
+
+    expected = pd.Series(values).rolling(window, min_periods=window).std().to_numpy()
+    result = rolling_std(values, window)
+
+    np.testing.assert_allclose(result, expected, rtol=1e-9, atol=1e-15, equal_nan=True)
+    if window > 1:
+        assert (result[60 + window - 1 : 80] == 0).all()
+
+
+def test_rolling_std_rejects_empty_window():
+    with pytest.raises(ValueError):
+        rolling_std(np.ones(5), 0)
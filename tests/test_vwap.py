@@ -29,3 +29,29 @@ def test_intraday_vwap_per_session():
     day2_last = out.loc[pd.Timestamp("2024-01-03 09:31", tz="UTC"), "vwap"]
     # Day2 VWAP = (103*100 + 104*300)/(100+300) = (10300 + 31200)/400 = 103.75
     assert abs(day2_last - 103.75) < 1e-6
+
+
+def test_intraday_vwap_skips_missing_bars_like_groupby_cumsum():
+    """
+    A NaN close or volume only blanks that bar's VWAP; later bars keep accumulating.
+    A NaN close still counts its volume, as pandas' skipna cumsum did.
+    """
+
+    rows = [
+        {"ts": "2024-01-02 09:30", "close": 100, "volume": 100},
+        {"ts": "2024-01-02 09:31", "close": float("nan"), "volume": 50},
+        {"ts": "2024-01-02 09:32", "close": 102, "volume": 200},
+        {"ts": "2024-01-02 09:33", "close": 101, "volume": float("nan")},
+        {"ts": "2024-01-02 09:34", "close": 104, "volume": 100},
+    ]
+    df = pd.DataFrame(rows)
+    df["ts"] = pd.to_datetime(df["ts"], utc=True)
+    df = df.set_index("ts")
+
+    vwap = intraday_vwap(df)["vwap"]
+
+    assert pd.isna(vwap.iloc[1]) and pd.isna(vwap.iloc[3])
+    # (100*100 + 102*200) / (100 + 50 + 200)
+    assert abs(vwap.iloc[2] - 30400 / 350) < 1e-9
+    # (100*100 + 102*200 + 104*100) / (100 + 50 + 200 + 100)
+    assert abs(vwap.iloc[4] - 40800 / 450) < 1e-9